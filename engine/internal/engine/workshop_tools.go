@@ -164,7 +164,8 @@ The map in the file context shows available regions, sizes, and chunk boundaries
 					"path": {"type": "string", "description": "CSV file path in the workbench"},
 					"query": {"type": "string", "description": "Read-only SQL query. Use table name data."},
 					"window_rows": {"type": "integer", "description": "Optional max rows for this response window"},
-					"window_offset": {"type": "integer", "description": "Optional window offset"}
+					"window_offset": {"type": "integer", "description": "Optional window offset"},
+					"include_total": {"type": "boolean", "description": "Optional; compute total_row_count for this window (defaults to true only when window_offset is 0)"}
 				},
 				"required": ["path", "query"]
 			}`),
@@ -1288,6 +1289,7 @@ func (h *ToolHandler) tableQuery(argsJSON string) (string, error) {
 		Query        string `json:"query"`
 		WindowRows   *int   `json:"window_rows"`
 		WindowOffset *int   `json:"window_offset"`
+		IncludeTotal *bool  `json:"include_total"`
 	}
 	if err := json.Unmarshal([]byte(argsJSON), &args); err != nil {
 		return "", workshopValidationError("invalid arguments")
@@ -1316,6 +1318,9 @@ func (h *ToolHandler) tableQuery(argsJSON string) (string, error) {
 		}
 		params["window_offset"] = *args.WindowOffset
 	}
+	if args.IncludeTotal != nil {
+		params["include_total"] = *args.IncludeTotal
+	}
 	return h.callJSONWorker("TabularQuery", params)
 }
 
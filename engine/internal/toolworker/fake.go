@@ -3,8 +3,10 @@ package toolworker
 import (
 	"bytes"
 	"context"
+	"crypto/sha256"
 	"encoding/base64"
 	"encoding/csv"
+	"encoding/hex"
 	"encoding/json"
 	"errors"
 	"fmt"
@@ -189,7 +191,7 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 		if err != nil {
 			return err
 		}
-		return assignResult(result, map[string]any{
+		mapResult := map[string]any{
 			"format":              "csv",
 			"delimiter":           ",",
 			"quote_char":          "\"",
@@ -199,8 +201,13 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 			"row_count":           len(rows),
 			"column_count":        len(cols),
 			"columns":             fakeTabularColumns(cols),
-			"chunks":              fakeTabularChunks(len(rows), 500),
-		})
+			"chunk_rows":          500,
+			"total_chunks":        (len(rows) + 499) / 500,
+		}
+		if includeChunks, ok := payload["include_chunks"].(bool); !ok || includeChunks {
+			mapResult["chunks"] = fakeTabularChunks(len(rows), 500)
+		}
+		return assignResult(result, mapResult)
 	case "TabularDescribe":
 		cols, rows, err := fakeReadCSVTable(fullPath)
 		if err != nil {
@@ -292,28 +299,47 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 			return err
 		}
 		query, _ := payload["query"].(string)
+		columns := []string{}
+		columnTypes := []string{}
+		resultRows := [][]any{}
 		if strings.Contains(strings.ToLower(query), "count(") {
-			return assignResult(result, map[string]any{
-				"columns":          []string{"count"},
-				"column_types":     []string{"integer"},
-				"rows":             [][]any{{len(rows)}},
-				"row_count":        1,
-				"total_row_count":  1,
-				"window_rows":      1,
-				"window_offset":    0,
-				"has_more":         false,
-				"query_elapsed_ms": 1,
-			})
+			columns = []string{"count"}
+			columnTypes = []string{"integer"}
+			resultRows = [][]any{{len(rows)}}
+		}
+		windowRows := fakeIndex(payload["window_rows"])
+		if windowRows <= 0 {
+			windowRows = 100
+		}
+		windowOffset := fakeIndex(payload["window_offset"])
+		start := windowOffset
+		if start > len(resultRows) {
+			start = len(resultRows)
+		}
+		end := start + windowRows
+		if end > len(resultRows) {
+			end = len(resultRows)
+		}
+		window := resultRows[start:end]
+		includeTotal, ok := payload["include_total"].(bool)
+		if !ok {
+			includeTotal = windowOffset == 0
+		}
+		totalKnown := includeTotal && (len(window) > 0 || windowOffset == 0)
+		var totalRowCount any
+		if totalKnown {
+			totalRowCount = len(resultRows)
 		}
 		return assignResult(result, map[string]any{
-			"columns":          []string{},
-			"column_types":     []string{},
-			"rows":             [][]any{},
-			"row_count":        0,
-			"total_row_count":  0,
-			"window_rows":      fakeIndex(payload["window_rows"]),
-			"window_offset":    fakeIndex(payload["window_offset"]),
-			"has_more":         false,
+			"columns":          columns,
+			"column_types":     columnTypes,
+			"rows":             window,
+			"row_count":        len(window),
+			"total_row_count":  totalRowCount,
+			"total_known":      totalKnown,
+			"window_rows":      windowRows,
+			"window_offset":    windowOffset,
+			"has_more":         end < len(resultRows),
 			"query_elapsed_ms": 1,
 		})
 	case "TabularExport":
@@ -342,6 +368,7 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 		})
 	case "TabularUpdateFromExport":
 		targetPath, _ := payload["target_path"].(string)
+		content := []byte("fake tabular update from export")
 		if targetPath != "" {
 			workbenchID, _ := payload["workbench_id"].(string)
 			targetRoot, _ := payload["target_root"].(string)
@@ -352,10 +379,11 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 			if err := os.MkdirAll(filepath.Dir(target), 0o755); err != nil {
 				return err
 			}
-			if err := os.WriteFile(target, []byte("fake tabular update from export"), 0o600); err != nil {
+			if err := os.WriteFile(target, content, 0o600); err != nil {
 				return err
 			}
 		}
+		digest := sha256.Sum256(content)
 		mode, _ := payload["mode"].(string)
 		if mode == "" {
 			mode = "replace_sheet"
@@ -371,6 +399,7 @@ func (f *Fake) Call(_ context.Context, method string, params any, result any) er
 			"row_count":     0,
 			"column_count":  0,
 			"written_range": "",
+			"sha256":        hex.EncodeToString(digest[:]),
 			"warnings":      []any{},
 		})
 	default:
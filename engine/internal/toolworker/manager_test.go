@@ -1,11 +1,14 @@
 package toolworker
 
 import (
+	"archive/zip"
 	"context"
 	"crypto/sha256"
+	"encoding/base64"
 	"encoding/hex"
 	"encoding/json"
 	"errors"
+	"io"
 	"os"
 	"os/exec"
 	"path/filepath"
@@ -1138,7 +1141,8 @@ func TestWorkerTabularCSVFlow(t *testing.T) {
 
 	var offsetResp struct {
 		Rows          [][]any `json:"rows"`
-		TotalRowCount int     `json:"total_row_count"`
+		TotalRowCount *int    `json:"total_row_count"`
+		TotalKnown    bool    `json:"total_known"`
 		HasMore       bool    `json:"has_more"`
 	}
 	if err := mgr.Call(ctx, "TabularQuery", map[string]any{
@@ -1151,7 +1155,7 @@ func TestWorkerTabularCSVFlow(t *testing.T) {
 	}, &offsetResp); err != nil {
 		t.Fatalf("TabularQuery offset window: %v", err)
 	}
-	if len(offsetResp.Rows) != 0 || offsetResp.TotalRowCount != 2 || offsetResp.HasMore {
+	if len(offsetResp.Rows) != 0 || offsetResp.TotalRowCount != nil || offsetResp.TotalKnown || offsetResp.HasMore {
 		t.Fatalf("unexpected offset query response: %#v", offsetResp)
 	}
 
@@ -1464,6 +1468,101 @@ wb.save(sys.argv[1])
 	}
 }
 
+func TestWorkerTabularUpdateFromExportNullRowsKeepExtent(t *testing.T) {
+	python := requirePython(t)
+	if !hasPythonModule(python, "duckdb") {
+		t.Skip("duckdb not available")
+	}
+	if !hasPythonModule(python, "openpyxl") {
+		t.Skip("openpyxl not available")
+	}
+
+	root := t.TempDir()
+	workbenches := filepath.Join(root, "workbenches")
+	if err := os.MkdirAll(workbenches, 0o755); err != nil {
+		t.Fatalf("mkdir: %v", err)
+	}
+	wbID := "wb-tabular-update-nulls"
+	draftDir := filepath.Join(workbenches, wbID, "draft")
+	if err := os.MkdirAll(draftDir, 0o755); err != nil {
+		t.Fatalf("draft dir: %v", err)
+	}
+	csvPath := filepath.Join(draftDir, "sales.csv")
+	if err := os.WriteFile(csvPath, []byte("region,amount\nwest,10\neast,3\nnorth,7\nsouth,1\ncentral,4\n"), 0o600); err != nil {
+		t.Fatalf("write csv: %v", err)
+	}
+
+	workerWrapper := makeWorkerWrapper(t, root, python)
+	os.Setenv("KEENBENCH_TOOL_WORKER_PATH", workerWrapper)
+	os.Setenv("KEENBENCH_WORKBENCHES_DIR", workbenches)
+	defer os.Unsetenv("KEENBENCH_TOOL_WORKER_PATH")
+	defer os.Unsetenv("KEENBENCH_WORKBENCHES_DIR")
+
+	mgr := New(workbenches, nil)
+	if err := mgr.Start(); err != nil {
+		t.Fatalf("start: %v", err)
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 12*time.Second)
+	defer cancel()
+
+	update := func(mode, query string) string {
+		t.Helper()
+		var resp struct {
+			WrittenRange string `json:"written_range"`
+		}
+		if err := mgr.Call(ctx, "TabularUpdateFromExport", map[string]any{
+			"workbench_id": wbID,
+			"path":         "sales.csv",
+			"root":         "draft",
+			"target_path":  "report.xlsx",
+			"target_root":  "draft",
+			"sheet":        "Data",
+			"mode":         mode,
+			"query":        query,
+		}, &resp); err != nil {
+			t.Fatalf("TabularUpdateFromExport %s: %v", mode, err)
+		}
+		return resp.WrittenRange
+	}
+
+	// Creates the workbook, so the NULL rows below go through the regular
+	// (not write-only) sheet writer.
+	if got := update("replace_sheet", "SELECT region, amount FROM data ORDER BY region"); got != "A1:B6" {
+		t.Fatalf("expected initial written_range A1:B6, got %q", got)
+	}
+	if got := update("replace_sheet", "SELECT NULL AS region, NULL AS amount FROM data"); got != "A1:B6" {
+		t.Fatalf("expected NULL rows written_range A1:B6, got %q", got)
+	}
+
+	// The saved sheet extent matches written_range even though the NULL
+	// slots hold no cells.
+	archive, err := zip.OpenReader(filepath.Join(draftDir, "report.xlsx"))
+	if err != nil {
+		t.Fatalf("open xlsx: %v", err)
+	}
+	defer archive.Close()
+	sheetXML := ""
+	for _, file := range archive.File {
+		if file.Name != "xl/worksheets/sheet1.xml" {
+			continue
+		}
+		reader, err := file.Open()
+		if err != nil {
+			t.Fatalf("open sheet part: %v", err)
+		}
+		data, err := io.ReadAll(reader)
+		reader.Close()
+		if err != nil {
+			t.Fatalf("read sheet part: %v", err)
+		}
+		sheetXML = string(data)
+	}
+	if !strings.Contains(sheetXML, `<dimension ref="A1:B6"`) {
+		t.Fatalf("expected saved dimension A1:B6, got sheet part %q", sheetXML)
+	}
+}
+
 func TestWorkerTabularQueryTimeoutGuardrail(t *testing.T) {
 	python := requirePython(t)
 	if !hasPythonModule(python, "duckdb") {
@@ -1615,6 +1714,424 @@ func TestWorkerTabularQueryValidationGuards(t *testing.T) {
 	}
 }
 
+func TestWorkerTabularQueryIncludeTotal(t *testing.T) {
+	python := requirePython(t)
+	if !hasPythonModule(python, "duckdb") {
+		t.Skip("duckdb not available")
+	}
+
+	root := t.TempDir()
+	workbenches := filepath.Join(root, "workbenches")
+	if err := os.MkdirAll(workbenches, 0o755); err != nil {
+		t.Fatalf("mkdir: %v", err)
+	}
+	wbID := "wb-tabular-total"
+	draftDir := filepath.Join(workbenches, wbID, "draft")
+	if err := os.MkdirAll(draftDir, 0o755); err != nil {
+		t.Fatalf("draft dir: %v", err)
+	}
+	csvPath := filepath.Join(draftDir, "values.csv")
+	builder := strings.Builder{}
+	builder.WriteString("value\n")
+	for i := 1; i <= 5; i++ {
+		builder.WriteString(strconv.Itoa(i))
+		builder.WriteByte('\n')
+	}
+	if err := os.WriteFile(csvPath, []byte(builder.String()), 0o600); err != nil {
+		t.Fatalf("write csv: %v", err)
+	}
+
+	workerWrapper := makeWorkerWrapper(t, root, python)
+	os.Setenv("KEENBENCH_TOOL_WORKER_PATH", workerWrapper)
+	os.Setenv("KEENBENCH_WORKBENCHES_DIR", workbenches)
+	defer os.Unsetenv("KEENBENCH_TOOL_WORKER_PATH")
+	defer os.Unsetenv("KEENBENCH_WORKBENCHES_DIR")
+
+	mgr := New(workbenches, nil)
+	if err := mgr.Start(); err != nil {
+		t.Fatalf("start: %v", err)
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
+	defer cancel()
+
+	type queryResp struct {
+		Rows          [][]any `json:"rows"`
+		RowCount      int     `json:"row_count"`
+		TotalRowCount *int    `json:"total_row_count"`
+		TotalKnown    bool    `json:"total_known"`
+		HasMore       bool    `json:"has_more"`
+	}
+	runQuery := func(offset int, includeTotal *bool) queryResp {
+		t.Helper()
+		params := map[string]any{
+			"workbench_id":  wbID,
+			"path":          "values.csv",
+			"root":          "draft",
+			"query":         "SELECT value FROM data ORDER BY value",
+			"window_rows":   2,
+			"window_offset": offset,
+		}
+		if includeTotal != nil {
+			params["include_total"] = *includeTotal
+		}
+		var resp queryResp
+		if err := mgr.Call(ctx, "TabularQuery", params, &resp); err != nil {
+			t.Fatalf("TabularQuery offset=%d: %v", offset, err)
+		}
+		return resp
+	}
+	yes, no := true, false
+
+	first := runQuery(0, nil)
+	if !first.TotalKnown || first.TotalRowCount == nil || *first.TotalRowCount != 5 {
+		t.Fatalf("expected first window to report total 5, got %#v", first)
+	}
+	if first.RowCount != 2 || !first.HasMore {
+		t.Fatalf("unexpected first window: %#v", first)
+	}
+
+	later := runQuery(2, nil)
+	if later.TotalKnown || later.TotalRowCount != nil {
+		t.Fatalf("expected later window to skip the total by default, got %#v", later)
+	}
+	if later.RowCount != 2 || !later.HasMore {
+		t.Fatalf("unexpected later window: %#v", later)
+	}
+
+	last := runQuery(4, &no)
+	if last.TotalKnown || last.RowCount != 1 || last.HasMore {
+		t.Fatalf("unexpected last window without total: %#v", last)
+	}
+
+	counted := runQuery(2, &yes)
+	if !counted.TotalKnown || counted.TotalRowCount == nil || *counted.TotalRowCount != 5 || !counted.HasMore {
+		t.Fatalf("expected include_total on a later window to report total 5, got %#v", counted)
+	}
+
+	uncounted := runQuery(0, &no)
+	if uncounted.TotalKnown || uncounted.TotalRowCount != nil || !uncounted.HasMore {
+		t.Fatalf("expected include_total=false on the first window to skip the total, got %#v", uncounted)
+	}
+
+	pastEnd := runQuery(10, &yes)
+	if pastEnd.TotalKnown || pastEnd.TotalRowCount != nil || pastEnd.RowCount != 0 || pastEnd.HasMore {
+		t.Fatalf("expected a window past the end to report an unknown total, got %#v", pastEnd)
+	}
+}
+
+func TestWorkerTabularGetMapChunks(t *testing.T) {
+	python := requirePython(t)
+	if !hasPythonModule(python, "duckdb") {
+		t.Skip("duckdb not available")
+	}
+
+	root := t.TempDir()
+	workbenches := filepath.Join(root, "workbenches")
+	if err := os.MkdirAll(workbenches, 0o755); err != nil {
+		t.Fatalf("mkdir: %v", err)
+	}
+	wbID := "wb-tabular-chunks"
+	draftDir := filepath.Join(workbenches, wbID, "draft")
+	if err := os.MkdirAll(draftDir, 0o755); err != nil {
+		t.Fatalf("draft dir: %v", err)
+	}
+	csvPath := filepath.Join(draftDir, "values.csv")
+	builder := strings.Builder{}
+	builder.WriteString("value\n")
+	for i := 1; i <= 250; i++ {
+		builder.WriteString(strconv.Itoa(i))
+		builder.WriteByte('\n')
+	}
+	if err := os.WriteFile(csvPath, []byte(builder.String()), 0o600); err != nil {
+		t.Fatalf("write csv: %v", err)
+	}
+
+	workerWrapper := makeWorkerWrapper(t, root, python)
+	os.Setenv("KEENBENCH_TOOL_WORKER_PATH", workerWrapper)
+	os.Setenv("KEENBENCH_WORKBENCHES_DIR", workbenches)
+	defer os.Unsetenv("KEENBENCH_TOOL_WORKER_PATH")
+	defer os.Unsetenv("KEENBENCH_WORKBENCHES_DIR")
+
+	mgr := New(workbenches, nil)
+	if err := mgr.Start(); err != nil {
+		t.Fatalf("start: %v", err)
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
+	defer cancel()
+
+	var withChunks map[string]any
+	if err := mgr.Call(ctx, "TabularGetMap", map[string]any{
+		"workbench_id": wbID,
+		"path":         "values.csv",
+		"root":         "draft",
+	}, &withChunks); err != nil {
+		t.Fatalf("TabularGetMap: %v", err)
+	}
+	chunkRows, _ := withChunks["chunk_rows"].(float64)
+	totalChunks, _ := withChunks["total_chunks"].(float64)
+	if chunkRows <= 0 {
+		t.Fatalf("expected positive chunk_rows, got %#v", withChunks["chunk_rows"])
+	}
+	wantChunks := (250 + int(chunkRows) - 1) / int(chunkRows)
+	if int(totalChunks) != wantChunks {
+		t.Fatalf("expected total_chunks %d, got %#v", wantChunks, withChunks["total_chunks"])
+	}
+	chunks, _ := withChunks["chunks"].([]any)
+	if len(chunks) != wantChunks {
+		t.Fatalf("expected %d chunks by default, got %#v", wantChunks, withChunks["chunks"])
+	}
+
+	var withoutChunks map[string]any
+	if err := mgr.Call(ctx, "TabularGetMap", map[string]any{
+		"workbench_id":   wbID,
+		"path":           "values.csv",
+		"root":           "draft",
+		"include_chunks": false,
+	}, &withoutChunks); err != nil {
+		t.Fatalf("TabularGetMap include_chunks=false: %v", err)
+	}
+	if _, ok := withoutChunks["chunks"]; ok {
+		t.Fatalf("expected chunks to be omitted, got %#v", withoutChunks["chunks"])
+	}
+	if withoutChunks["chunk_rows"] != withChunks["chunk_rows"] || withoutChunks["total_chunks"] != withChunks["total_chunks"] {
+		t.Fatalf("expected chunk_rows/total_chunks without the chunk list, got %#v", withoutChunks)
+	}
+	if int(withoutChunks["row_count"].(float64)) != 250 {
+		t.Fatalf("unexpected row_count: %#v", withoutChunks["row_count"])
+	}
+}
+
+func TestWorkerTabularUpdateFromExportExpectedSha256(t *testing.T) {
+	python := requirePython(t)
+	if !hasPythonModule(python, "duckdb") {
+		t.Skip("duckdb not available")
+	}
+	if !hasPythonModule(python, "openpyxl") {
+		t.Skip("openpyxl not available")
+	}
+
+	root := t.TempDir()
+	workbenches := filepath.Join(root, "workbenches")
+	if err := os.MkdirAll(workbenches, 0o755); err != nil {
+		t.Fatalf("mkdir: %v", err)
+	}
+	wbID := "wb-tabular-update-sha"
+	draftDir := filepath.Join(workbenches, wbID, "draft")
+	if err := os.MkdirAll(draftDir, 0o755); err != nil {
+		t.Fatalf("draft dir: %v", err)
+	}
+	csvPath := filepath.Join(draftDir, "sales.csv")
+	if err := os.WriteFile(csvPath, []byte("region,amount\nwest,10\neast,3\n"), 0o600); err != nil {
+		t.Fatalf("write csv: %v", err)
+	}
+	xlsxPath := filepath.Join(draftDir, "report.xlsx")
+
+	workerWrapper := makeWorkerWrapper(t, root, python)
+	os.Setenv("KEENBENCH_TOOL_WORKER_PATH", workerWrapper)
+	os.Setenv("KEENBENCH_WORKBENCHES_DIR", workbenches)
+	defer os.Unsetenv("KEENBENCH_TOOL_WORKER_PATH")
+	defer os.Unsetenv("KEENBENCH_WORKBENCHES_DIR")
+
+	mgr := New(workbenches, nil)
+	if err := mgr.Start(); err != nil {
+		t.Fatalf("start: %v", err)
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 12*time.Second)
+	defer cancel()
+
+	fileSha256 := func() string {
+		t.Helper()
+		data, err := os.ReadFile(xlsxPath)
+		if err != nil {
+			t.Fatalf("read xlsx: %v", err)
+		}
+		sum := sha256.Sum256(data)
+		return hex.EncodeToString(sum[:])
+	}
+	update := func(mode string, expected *string) (string, error) {
+		t.Helper()
+		params := map[string]any{
+			"workbench_id": wbID,
+			"path":         "sales.csv",
+			"root":         "draft",
+			"target_path":  "report.xlsx",
+			"target_root":  "draft",
+			"sheet":        "Data",
+			"mode":         mode,
+			"query":        "SELECT region, amount FROM data ORDER BY region",
+		}
+		if expected != nil {
+			params["expected_prev_sha256"] = *expected
+		}
+		var resp struct {
+			Sha256 string `json:"sha256"`
+		}
+		err := mgr.Call(ctx, "TabularUpdateFromExport", params, &resp)
+		return resp.Sha256, err
+	}
+	requireValidationFailed := func(err error) {
+		t.Helper()
+		if err == nil {
+			t.Fatalf("expected expected_prev_sha256 mismatch error")
+		}
+		var remoteErr *RemoteError
+		if !errors.As(err, &remoteErr) {
+			t.Fatalf("expected remote error, got %T: %v", err, err)
+		}
+		if remoteErr.Code != "VALIDATION_FAILED" {
+			t.Fatalf("expected VALIDATION_FAILED, got %s (%s)", remoteErr.Code, remoteErr.Message)
+		}
+	}
+
+	missing := ""
+	created, err := update("replace_sheet", &missing)
+	if err != nil {
+		t.Fatalf("TabularUpdateFromExport with empty expected_prev_sha256: %v", err)
+	}
+	if created == "" || created != fileSha256() {
+		t.Fatalf("expected sha256 of the written workbook, got %q", created)
+	}
+
+	_, err = update("replace_sheet", &missing)
+	requireValidationFailed(err)
+
+	stale := strings.Repeat("0", 64)
+	_, err = update("append_rows", &stale)
+	requireValidationFailed(err)
+	if fileSha256() != created {
+		t.Fatalf("expected rejected update to leave the workbook untouched")
+	}
+
+	appended, err := update("append_rows", &created)
+	if err != nil {
+		t.Fatalf("TabularUpdateFromExport with matching expected_prev_sha256: %v", err)
+	}
+	if appended == created || appended != fileSha256() {
+		t.Fatalf("expected sha256 of the updated workbook, got %q", appended)
+	}
+
+	unchecked, err := update("replace_sheet", nil)
+	if err != nil {
+		t.Fatalf("TabularUpdateFromExport without expected_prev_sha256: %v", err)
+	}
+	if unchecked != fileSha256() {
+		t.Fatalf("expected sha256 of the replaced workbook, got %q", unchecked)
+	}
+}
+
+func TestWorkerPdfRenderPageWebp(t *testing.T) {
+	python := requirePython(t)
+	if !hasPythonModule(python, "fitz") {
+		t.Skip("pymupdf not available")
+	}
+	if !hasPythonModule(python, "PIL") {
+		t.Skip("pillow not available")
+	}
+
+	root := t.TempDir()
+	workbenches := filepath.Join(root, "workbenches")
+	if err := os.MkdirAll(workbenches, 0o755); err != nil {
+		t.Fatalf("mkdir: %v", err)
+	}
+	wbID := "wb-pdf-webp"
+	draftDir := filepath.Join(workbenches, wbID, "draft")
+	if err := os.MkdirAll(draftDir, 0o755); err != nil {
+		t.Fatalf("draft dir: %v", err)
+	}
+	pdfPath := filepath.Join(draftDir, "page.pdf")
+
+	makeScript := filepath.Join(root, "make_pdf.py")
+	makeCode := `import fitz
+import sys
+
+doc = fitz.open()
+page = doc.new_page()
+page.insert_text((72, 72), "Preview format check")
+doc.save(sys.argv[1])
+`
+	makeCode = "#!/usr/bin/env " + filepath.Base(python) + "\n" + makeCode
+	if err := os.WriteFile(makeScript, []byte(makeCode), 0o700); err != nil {
+		t.Fatalf("write make script: %v", err)
+	}
+	if out, err := exec.Command(python, makeScript, pdfPath).CombinedOutput(); err != nil {
+		t.Fatalf("make pdf: %v (%s)", err, string(out))
+	}
+
+	workerWrapper := makeWorkerWrapper(t, root, python)
+	os.Setenv("KEENBENCH_TOOL_WORKER_PATH", workerWrapper)
+	os.Setenv("KEENBENCH_WORKBENCHES_DIR", workbenches)
+	defer os.Unsetenv("KEENBENCH_TOOL_WORKER_PATH")
+	defer os.Unsetenv("KEENBENCH_WORKBENCHES_DIR")
+
+	mgr := New(workbenches, nil)
+	if err := mgr.Start(); err != nil {
+		t.Fatalf("start: %v", err)
+	}
+
+	ctx, cancel := context.WithTimeout(context.Background(), 10*time.Second)
+	defer cancel()
+
+	type renderResp struct {
+		BytesBase64 string `json:"bytes_base64"`
+		MimeType    string `json:"mime_type"`
+		PageCount   int    `json:"page_count"`
+	}
+	render := func(format string) (renderResp, error) {
+		t.Helper()
+		params := map[string]any{
+			"workbench_id": wbID,
+			"path":         "page.pdf",
+			"root":         "draft",
+			"page_index":   0,
+			"scale":        0.5,
+		}
+		if format != "" {
+			params["format"] = format
+		}
+		var resp renderResp
+		err := mgr.Call(ctx, "PdfRenderPage", params, &resp)
+		return resp, err
+	}
+
+	pngResp, err := render("")
+	if err != nil {
+		t.Fatalf("PdfRenderPage default: %v", err)
+	}
+	if pngResp.MimeType != "image/png" {
+		t.Fatalf("expected png by default, got %q", pngResp.MimeType)
+	}
+
+	webpResp, err := render("webp")
+	if err != nil {
+		t.Fatalf("PdfRenderPage webp: %v", err)
+	}
+	if webpResp.MimeType != "image/webp" || webpResp.PageCount != 1 {
+		t.Fatalf("unexpected webp response: %#v", webpResp.MimeType)
+	}
+	data, err := base64.StdEncoding.DecodeString(webpResp.BytesBase64)
+	if err != nil {
+		t.Fatalf("decode webp: %v", err)
+	}
+	if len(data) < 12 || string(data[0:4]) != "RIFF" || string(data[8:12]) != "WEBP" {
+		t.Fatalf("expected RIFF/WEBP image bytes")
+	}
+
+	_, err = render("gif")
+	if err == nil {
+		t.Fatalf("expected unsupported format error")
+	}
+	var remoteErr *RemoteError
+	if !errors.As(err, &remoteErr) {
+		t.Fatalf("expected remote error, got %T: %v", err, err)
+	}
+	if remoteErr.Code != "VALIDATION_FAILED" {
+		t.Fatalf("expected VALIDATION_FAILED, got %s (%s)", remoteErr.Code, remoteErr.Message)
+	}
+}
+
 func TestWorkerDocxGetStylesAndCopyStyle(t *testing.T) {
 	python := requirePython(t)
 	if !hasPythonModule(python, "docx") {
@@ -1,14 +1,18 @@
 #!/usr/bin/env python3
+import atexit
 import base64
+import binascii
 import csv
 import copy as pycopy
 import datetime
 import decimal
+import functools
 import hashlib
 import io
 import json
 import math
 import os
+import pathlib
 import re
 import sys
 import tempfile
@@ -17,7 +21,7 @@ import subprocess
 import threading
 import time
 import traceback
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 JSONRPC_VERSION = "2.0"
 ERROR_CODE = -32000
@@ -28,12 +32,16 @@ MIN_SCALE = 0.25
 MAX_SCALE = 2.0
 MAX_GRID_ROWS = 200
 MAX_GRID_COLS = 50
+PREVIEW_PNG_COMPRESS_LEVEL = 1
+IMAGE_B64_CHUNK_BYTES = 3 * 1024 * 1024
+PREVIEW_MIME_TYPES = {"png": "image/png", "webp": "image/webp"}
 
 # Chunk sizes for file maps
 XLSX_CHUNK_ROWS = 50
 DOCX_CHUNK_CHARS = 4000
 PDF_CHUNK_PAGES = 5
 TEXT_CHUNK_LINES = 200
+TEXT_READ_CHUNK_CHARS = 1024 * 1024
 TABULAR_CHUNK_ROWS = 100
 TABULAR_CACHE_VERSION = 1
 TABULAR_TABLE_NAME = "data"
@@ -41,9 +49,20 @@ TABULAR_TOTAL_COUNT_COLUMN = "__keenbench_total_row_count"
 TABULAR_QUERY_TIMEOUT_MS = 5000
 TABULAR_MEMORY_LIMIT_MB = 512
 TABULAR_MAX_THREADS = 2
+TABULAR_CONNECTION_POOL_SIZE = 4
+TABULAR_RACY_WINDOW_NS = 2_000_000_000
+TABULAR_HASH_CHUNK_BYTES = 2 * 1024 * 1024
+TABULAR_SNIFF_SAMPLE_ROWS = 20_000
+TABULAR_EXPORT_FETCH_ROWS = 10_000
+PDF_READER_RACY_WINDOW_NS = 2_000_000_000
 
 WORKBENCHES_DIR = ""
 PREVIEW_RENDERER_PATH = ""
+PREVIEW_PROFILE_DIR = ""
+SVG_RENDERER = "auto"
+SVG_RENDERERS = ("auto", "pyvips", "cairosvg")
+PDF_TEXT_ENGINE = "pypdf"
+PDF_TEXT_ENGINES = ("pypdf", "pdfium")
 DEBUG_ENABLED = False
 LOG_LEVEL = "info"
 LOG_LEVELS = {"debug": 10, "info": 20, "warn": 30, "error": 40}
@@ -178,6 +197,8 @@ def load_env_file() -> Dict[str, Any]:
 def init_config() -> None:
     global WORKBENCHES_DIR, PREVIEW_RENDERER_PATH, DEBUG_ENABLED, LOG_LEVEL
     global TABULAR_QUERY_TIMEOUT_MS, TABULAR_MEMORY_LIMIT_MB, TABULAR_MAX_THREADS
+    global TABULAR_CONNECTION_POOL_SIZE
+    global PREVIEW_PNG_COMPRESS_LEVEL, SVG_RENDERER, PDF_TEXT_ENGINE
     env_result = load_env_file()
     DEBUG_ENABLED = parse_bool(os.environ.get("KEENBENCH_DEBUG"))
     LOG_LEVEL = "debug" if DEBUG_ENABLED else "info"
@@ -201,6 +222,22 @@ def init_config() -> None:
         1,
         64,
     )
+    TABULAR_CONNECTION_POOL_SIZE = parse_int_clamped(
+        os.environ.get("KEENBENCH_TABULAR_CONNECTION_POOL_SIZE"),
+        TABULAR_CONNECTION_POOL_SIZE,
+        0,
+        16,
+    )
+    PREVIEW_PNG_COMPRESS_LEVEL = parse_int_clamped(
+        os.environ.get("KEENBENCH_PREVIEW_PNG_LEVEL"),
+        PREVIEW_PNG_COMPRESS_LEVEL,
+        0,
+        9,
+    )
+    svg_renderer = os.environ.get("KEENBENCH_SVG_RENDERER", "").strip().lower()
+    SVG_RENDERER = svg_renderer if svg_renderer in SVG_RENDERERS else "auto"
+    pdf_text_engine = os.environ.get("KEENBENCH_PDF_TEXT_ENGINE", "").strip().lower()
+    PDF_TEXT_ENGINE = pdf_text_engine if pdf_text_engine in PDF_TEXT_ENGINES else "pypdf"
     log_info(
         "worker.start",
         version=WORKER_VERSION,
@@ -210,6 +247,10 @@ def init_config() -> None:
         tabular_query_timeout_ms=TABULAR_QUERY_TIMEOUT_MS,
         tabular_memory_limit_mb=TABULAR_MEMORY_LIMIT_MB,
         tabular_max_threads=TABULAR_MAX_THREADS,
+        tabular_connection_pool_size=TABULAR_CONNECTION_POOL_SIZE,
+        preview_png_compress_level=PREVIEW_PNG_COMPRESS_LEVEL,
+        svg_renderer=SVG_RENDERER,
+        pdf_text_engine=PDF_TEXT_ENGINE,
     )
     if env_result.get("loaded"):
         log_debug(
@@ -233,6 +274,16 @@ class WorkerError(Exception):
 
 
 def send_response(resp: Dict[str, Any]) -> None:
+    if _ORJSON is not None:
+        try:
+            data = _ORJSON.dumps(resp, option=_ORJSON.OPT_NON_STR_KEYS | _ORJSON.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # Integers past 64 bits and lone surrogates; the stdlib encoder copes.
+            data = None
+        if data is not None:
+            sys.stdout.buffer.write(data)
+            sys.stdout.buffer.flush()
+            return
     sys.stdout.write(json.dumps(resp))
     sys.stdout.write("\n")
     sys.stdout.flush()
@@ -361,6 +412,43 @@ def clamp_scale(value: Any) -> float:
     return scale
 
 
+def parse_preview_format(value: Any) -> str:
+    if value is None or value == "":
+        return "png"
+    fmt = str(value).strip().lower()
+    if fmt not in PREVIEW_MIME_TYPES:
+        raise WorkerError("VALIDATION_FAILED", "unsupported preview format")
+    return fmt
+
+
+@functools.lru_cache(maxsize=None)
+def optional_module(name: str) -> Any:
+    # Accelerators that are not in requirements.txt; probe each once so
+    # callers can fall back without retrying a failed import per request.
+    try:
+        return __import__(name)
+    except Exception:
+        return None
+
+
+# The Go side frames messages by newline, so only the codec changes: orjson
+# parses and serializes large ops/rows payloads several times faster.
+_ORJSON = optional_module("orjson")
+
+
+def _range_chunks(total: int, chunk_size: int, key: str) -> List[Dict[str, Any]]:
+    """Split 1..total into inclusive "start-end" ranges of chunk_size items."""
+    last = chunk_size - 1
+    chunks = [
+        {"index": index, key: f"{start}-{start + last}"}
+        for index, start in enumerate(range(1, total - last + 1, chunk_size))
+    ]
+    remainder = total % chunk_size if total > 0 else 0
+    if remainder:
+        chunks.append({"index": len(chunks), key: f"{total - remainder + 1}-{total}"})
+    return chunks
+
+
 def import_module(name: str):
     try:
         return __import__(name)
@@ -991,18 +1079,19 @@ def docx_render_page(params: Dict[str, Any]) -> Dict[str, Any]:
     path = resolve_path(params)
     page_index = int(params.get("page_index", 0))
     scale = clamp_scale(params.get("scale", 1.0))
+    image_format = parse_preview_format(params.get("format"))
     try:
         pdf_path, tmp_dir = convert_to_pdf(path)
     except WorkerError as err:
         if err.code not in ("TOOL_WORKER_UNAVAILABLE", "FILE_READ_FAILED"):
             raise
         log_info("preview.docx_fallback", path=path, reason=err.message)
-        return render_docx_page_fallback(path, page_index, scale)
+        return render_docx_page_fallback(path, page_index, scale, image_format)
     except Exception as err:
         log_info("preview.docx_fallback", path=path, reason=str(err))
-        return render_docx_page_fallback(path, page_index, scale)
+        return render_docx_page_fallback(path, page_index, scale, image_format)
     try:
-        return render_pdf_page(pdf_path, page_index, scale)
+        return render_pdf_page(pdf_path, page_index, scale, image_format)
     finally:
         shutil.rmtree(tmp_dir, ignore_errors=True)
 
@@ -1680,9 +1769,10 @@ def odt_render_page(params: Dict[str, Any]) -> Dict[str, Any]:
     path = resolve_path(params)
     page_index = int(params.get("page_index", 0))
     scale = clamp_scale(params.get("scale", 1.0))
+    image_format = parse_preview_format(params.get("format"))
     pdf_path, tmp_dir = convert_to_pdf(path)
     try:
-        return render_pdf_page(pdf_path, page_index, scale)
+        return render_pdf_page(pdf_path, page_index, scale, image_format)
     finally:
         shutil.rmtree(tmp_dir, ignore_errors=True)
 
@@ -3070,6 +3160,10 @@ def _build_island(ws, start_row: int, end_row: int, min_col: int, max_col: int)
 
 
 # ------------------ PPTX ------------------
+#
+# Decks are opened by path on purpose. python-pptx reads every zip member into
+# memory while loading the package, so mmap-backed or pre-buffered handles do
+# not keep blobs out of RSS and measured no faster than a plain path open.
 
 def pptx_apply_ops(params: Dict[str, Any]) -> Dict[str, Any]:
     pptx = import_module("pptx")
@@ -3507,10 +3601,9 @@ def pptx_extract_text(params: Dict[str, Any]) -> Dict[str, Any]:
         slide = prs.slides[idx]
         lines = [f"# Slide {idx + 1}"]
         for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                text = shape.text
-                if text:
-                    lines.append(text)
+            text = getattr(shape, "text", None)
+            if text:
+                lines.append(text)
         result: Dict[str, Any] = {"text": "\n".join(lines)}
         if total_slides > 1:
             result["chunk_info"] = {
@@ -3525,10 +3618,9 @@ def pptx_extract_text(params: Dict[str, Any]) -> Dict[str, Any]:
     for idx, slide in enumerate(prs.slides, start=1):
         lines.append(f"# Slide {idx}")
         for shape in slide.shapes:
-            if hasattr(shape, "text"):
-                text = shape.text
-                if text:
-                    lines.append(text)
+            text = getattr(shape, "text", None)
+            if text:
+                lines.append(text)
     return {"text": "\n".join(lines)}
 
 
@@ -3536,18 +3628,19 @@ def pptx_render_slide(params: Dict[str, Any]) -> Dict[str, Any]:
     path = resolve_path(params)
     slide_index = int(params.get("slide_index", 0))
     scale = clamp_scale(params.get("scale", 1.0))
+    image_format = parse_preview_format(params.get("format"))
     try:
         pdf_path, tmp_dir = convert_to_pdf(path)
     except WorkerError as err:
         if err.code not in ("TOOL_WORKER_UNAVAILABLE", "FILE_READ_FAILED"):
             raise
         log_info("preview.pptx_fallback", path=path, reason=err.message)
-        return render_pptx_slide_fallback(path, slide_index, scale)
+        return render_pptx_slide_fallback(path, slide_index, scale, image_format)
     except Exception as err:
         log_info("preview.pptx_fallback", path=path, reason=str(err))
-        return render_pptx_slide_fallback(path, slide_index, scale)
+        return render_pptx_slide_fallback(path, slide_index, scale, image_format)
     try:
-        result = render_pdf_page(pdf_path, slide_index, scale)
+        result = render_pdf_page(pdf_path, slide_index, scale, image_format)
         slide_count = result.pop("page_count", 0)
         result["slide_count"] = slide_count
         return result
@@ -3583,10 +3676,14 @@ def pptx_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
         has_notes = False
         if slide.has_notes_slide:
             notes_slide = slide.notes_slide
-            if notes_slide and notes_slide.notes_text_frame:
-                notes_text = notes_slide.notes_text_frame.text.strip()
-                if notes_text:
-                    has_notes = True
+            notes_frame = notes_slide.notes_text_frame if notes_slide else None
+            if notes_frame is not None:
+                # Stop at the first non-blank paragraph instead of joining the whole frame.
+                for paragraph in notes_frame.paragraphs:
+                    paragraph_text = paragraph.text
+                    if paragraph_text and paragraph_text.strip():
+                        has_notes = True
+                        break
 
         slides_out.append({
             "index": idx,
@@ -3688,15 +3785,31 @@ def pptx_copy_assets(params: Dict[str, Any]) -> Dict[str, Any]:
     src_prs = pptx.Presentation(source_path)
     dst_prs = pptx.Presentation(target_path) if os.path.exists(target_path) else pptx.Presentation()
     copied: List[Dict[str, Any]] = []
+    # Slide lists are fixed for the request; source shape lists are cached per slide.
+    # Target shapes are re-listed per asset because add_picture appends to them.
+    src_slides = list(src_prs.slides)
+    dst_slides = list(dst_prs.slides)
+    src_shapes_by_slide: Dict[int, List[Any]] = {}
+
+    def _source_shapes(slide_index: int) -> List[Any]:
+        shapes = src_shapes_by_slide.get(slide_index)
+        if shapes is None:
+            src_slide = _pptx_get_slide(src_slides, slide_index, "source_slide_index")
+            shapes = list(src_slide.shapes)
+            src_shapes_by_slide[slide_index] = shapes
+        return shapes
+
+    # Source images keyed by (slide, shape) so fan-out copies read and hash each blob once.
+    image_blobs: Dict[Tuple[int, int], Tuple[bytes, str]] = {}
 
     normalized_assets = [_pptx_parse_asset(asset) for asset in assets]
     for item in normalized_assets:
         asset_type = item["type"]
         if asset_type == "text_style":
-            src_slide = _pptx_get_slide(src_prs, item["source_slide_index"], "source_slide_index")
-            dst_slide = _pptx_get_slide(dst_prs, item["target_slide_index"], "target_slide_index")
-            src_shape = _pptx_get_shape(src_slide, item["source_shape_index"], "source_shape_index")
-            dst_shape = _pptx_get_shape(dst_slide, item["target_shape_index"], "target_shape_index")
+            src_shapes = _source_shapes(item["source_slide_index"])
+            dst_slide = _pptx_get_slide(dst_slides, item["target_slide_index"], "target_slide_index")
+            src_shape = _pptx_get_shape(src_shapes, item["source_shape_index"], "source_shape_index")
+            dst_shape = _pptx_get_shape(list(dst_slide.shapes), item["target_shape_index"], "target_shape_index")
             _pptx_copy_text_style(src_shape, dst_shape)
             copied.append(
                 {
@@ -3707,16 +3820,22 @@ def pptx_copy_assets(params: Dict[str, Any]) -> Dict[str, Any]:
             )
             continue
         if asset_type == "image":
-            src_slide = _pptx_get_slide(src_prs, item["source_slide_index"], "source_slide_index")
-            dst_slide = _pptx_get_slide(dst_prs, item["target_slide_index"], "target_slide_index")
-            src_shape = _pptx_get_shape(src_slide, item["source_shape_index"], "source_shape_index")
-            image_ref = _pptx_image_ref(src_shape)
-            if image_ref is None:
-                raise WorkerError("VALIDATION_FAILED", "source shape does not contain an image")
-            try:
-                blob = src_shape.image.blob
-            except Exception:
-                raise WorkerError("FILE_READ_FAILED", "failed to read source image blob")
+            src_shapes = _source_shapes(item["source_slide_index"])
+            dst_slide = _pptx_get_slide(dst_slides, item["target_slide_index"], "target_slide_index")
+            src_shape = _pptx_get_shape(src_shapes, item["source_shape_index"], "source_shape_index")
+            image_key = (item["source_slide_index"], item["source_shape_index"])
+            cached_image = image_blobs.get(image_key)
+            if cached_image is None:
+                image_ref = _pptx_image_ref(src_shape)
+                if image_ref is None:
+                    raise WorkerError("VALIDATION_FAILED", "source shape does not contain an image")
+                try:
+                    blob = src_shape.image.blob
+                except Exception:
+                    raise WorkerError("FILE_READ_FAILED", "failed to read source image blob")
+                cached_image = (blob, image_ref.get("sha1") or _sha1_of_bytes(blob))
+                image_blobs[image_key] = cached_image
+            blob, blob_sha1 = cached_image
             left = getattr(src_shape, "left", 0)
             top = getattr(src_shape, "top", 0)
             width = getattr(src_shape, "width", None)
@@ -3728,7 +3847,7 @@ def pptx_copy_assets(params: Dict[str, Any]) -> Dict[str, Any]:
                     "source": f"{item['source_slide_index']}:{item['source_shape_index']}",
                     "target_slide_index": item["target_slide_index"],
                     "size_bytes": len(blob),
-                    "sha1": _sha1_of_bytes(blob),
+                    "sha1": blob_sha1,
                 }
             )
             continue
@@ -3758,7 +3877,13 @@ def pptx_get_slide_content(params: Dict[str, Any]) -> Dict[str, Any]:
     slide = prs.slides[slide_index]
     slide_title = slide.shapes.title.text if slide.shapes.title else None
     layout_name = slide.slide_layout.name if slide.slide_layout else None
-    shapes = [_pptx_shape_payload(shape, idx) for idx, shape in enumerate(slide.shapes)]
+    positioned = detail == "positioned"
+    slide_width, slide_height = _pptx_slide_size(prs) if positioned else (1, 1)
+    shapes: List[Dict[str, Any]] = []
+    positioned_items: List[Optional[Dict[str, Any]]] = []
+    for shape_payload, positioned_item in _pptx_build_shape_payloads(slide, slide_width, slide_height, positioned):
+        shapes.append(shape_payload)
+        positioned_items.append(positioned_item)
     notes = None
     if slide.has_notes_slide:
         try:
@@ -3774,8 +3899,8 @@ def pptx_get_slide_content(params: Dict[str, Any]) -> Dict[str, Any]:
         "shapes": shapes,
         "notes": notes,
     }
-    if detail == "positioned":
-        slide_payload["positioned"] = _pptx_positioned_slide_payload(slide, prs)
+    if positioned:
+        slide_payload["positioned"] = _pptx_positioned_slide_payload(slide_width, slide_height, positioned_items)
         slide_payload["render_mode"] = "positioned"
     else:
         slide_payload["render_mode"] = "layout_lite"
@@ -3855,31 +3980,26 @@ def _pptx_parse_asset(asset: Any) -> Dict[str, Any]:
     return out
 
 
+_PPTX_SLIDE_SHAPE_REF_RE = re.compile(r"\s*(\d+)\s*:\s*(\d+)\s*\Z")
+
+
 def _pptx_parse_slide_shape_ref(value: str) -> Tuple[int, int]:
-    text = value.strip()
-    if ":" not in text:
-        raise WorkerError("VALIDATION_FAILED", f"invalid slide/shape selector: {value}")
-    slide_text, shape_text = text.split(":", 1)
-    try:
-        slide_index = int(slide_text.strip())
-        shape_index = int(shape_text.strip())
-    except Exception:
-        raise WorkerError("VALIDATION_FAILED", f"invalid slide/shape selector: {value}")
-    if slide_index < 0 or shape_index < 0:
+    match = _PPTX_SLIDE_SHAPE_REF_RE.match(value)
+    if match is None:
         raise WorkerError("VALIDATION_FAILED", f"invalid slide/shape selector: {value}")
-    return slide_index, shape_index
+    return int(match.group(1)), int(match.group(2))
 
 
-def _pptx_get_slide(prs, slide_index: int, field_name: str):
-    if slide_index < 0 or slide_index >= len(prs.slides):
+def _pptx_get_slide(slides: List[Any], slide_index: int, field_name: str):
+    if slide_index < 0 or slide_index >= len(slides):
         raise WorkerError("VALIDATION_FAILED", f"invalid {field_name}")
-    return prs.slides[slide_index]
+    return slides[slide_index]
 
 
-def _pptx_get_shape(slide, shape_index: int, field_name: str):
-    if shape_index < 0 or shape_index >= len(slide.shapes):
+def _pptx_get_shape(shapes: List[Any], shape_index: int, field_name: str):
+    if shape_index < 0 or shape_index >= len(shapes):
         raise WorkerError("VALIDATION_FAILED", f"invalid {field_name}")
-    return slide.shapes[shape_index]
+    return shapes[shape_index]
 
 
 def _pptx_copy_text_style(src_shape, dst_shape) -> None:
@@ -3907,23 +4027,104 @@ def _pptx_copy_text_style(src_shape, dst_shape) -> None:
 
     template_run = src_runs[0]
     template_font = template_run.font
+    if template_font is None:
+        return
+    template_values: Dict[str, Any] = {}
+    for attr in ("name", "size", "bold", "italic", "underline"):
+        try:
+            template_values[attr] = getattr(template_font, attr)
+        except Exception:
+            pass
+    template_rgb = None
+    try:
+        if template_font.color is not None and template_font.color.rgb is not None:
+            template_rgb = template_font.color.rgb
+    except Exception:
+        template_rgb = None
+
     for run in dst_runs:
         font = run.font
-        if template_font is None or font is None:
+        if font is None:
             continue
-        for attr in ("name", "size", "bold", "italic", "underline"):
+        for attr, value in template_values.items():
             try:
-                setattr(font, attr, getattr(template_font, attr))
+                setattr(font, attr, value)
             except Exception:
                 pass
-        try:
-            if template_font.color is not None and template_font.color.rgb is not None:
-                font.color.rgb = template_font.color.rgb
-        except Exception:
-            pass
+        if template_rgb is not None:
+            try:
+                font.color.rgb = template_rgb
+            except Exception:
+                pass
+
+
+def _pptx_build_shape_payloads(
+    slide: Any,
+    slide_width: int,
+    slide_height: int,
+    want_positioned: bool,
+):
+    """Yield (shape_payload, positioned_payload) per shape from one walk of slide.shapes."""
+    for shape_index, shape in enumerate(slide.shapes):
+        text_walk = _pptx_text_frame_paragraphs(shape)
+        image_ref = _pptx_image_ref(shape)
+        shape_payload = _pptx_shape_payload(shape, shape_index, text_walk, image_ref)
+        positioned_payload = None
+        if want_positioned:
+            positioned_payload = _pptx_positioned_shape_payload(
+                shape, shape_index, slide_width, slide_height, text_walk, image_ref
+            )
+        yield shape_payload, positioned_payload
 
 
-def _pptx_shape_payload(shape, shape_index: int) -> Dict[str, Any]:
+def _pptx_text_frame_paragraphs(shape: Any) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]:
+    """Return (paragraphs, runs of a paragraph that failed part-way, complete)."""
+    paragraphs: List[Dict[str, Any]] = []
+    runs: List[Dict[str, Any]] = []
+    if not getattr(shape, "has_text_frame", False):
+        return paragraphs, runs, True
+    try:
+        for paragraph_index, paragraph in enumerate(shape.text_frame.paragraphs):
+            runs = []
+            for run_index, run in enumerate(paragraph.runs):
+                runs.append(_pptx_run_payload(run, run_index))
+            paragraphs.append(
+                {
+                    "index": paragraph_index,
+                    "level": int(getattr(paragraph, "level", 0)),
+                    "text": _pptx_paragraph_text(paragraph, runs),
+                    "runs": runs,
+                }
+            )
+            runs = []
+    except Exception:
+        return paragraphs, runs, False
+    return paragraphs, [], True
+
+
+_PPTX_DRAWINGML_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_PPTX_NON_RUN_TEXT_TAGS = (_PPTX_DRAWINGML_NS + "br", _PPTX_DRAWINGML_NS + "fld")
+
+
+def _pptx_paragraph_text(paragraph: Any, runs: List[Dict[str, Any]]) -> str:
+    # paragraph.text re-walks the runs; reuse their payload text unless the
+    # paragraph also holds line breaks or fields, which only .text renders.
+    p_elm = getattr(paragraph, "_p", None)
+    if p_elm is not None:
+        for tag in _PPTX_NON_RUN_TEXT_TAGS:
+            if p_elm.find(tag) is not None:
+                break
+        else:
+            return "".join(run["text"] for run in runs)
+    return paragraph.text or ""
+
+
+def _pptx_shape_payload(
+    shape,
+    shape_index: int,
+    text_walk: Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool],
+    image_ref: Optional[Dict[str, Any]],
+) -> Dict[str, Any]:
     shape_type_name = _pptx_shape_type_name(shape)
     payload: Dict[str, Any] = {
         "index": shape_index,
@@ -3941,24 +4142,8 @@ def _pptx_shape_payload(shape, shape_index: int) -> Dict[str, Any]:
             payload["placeholder_type"] = str(shape.placeholder_format.type)
         except Exception:
             payload["placeholder_type"] = None
-    text_blocks: List[Dict[str, Any]] = []
-    if getattr(shape, "has_text_frame", False):
-        try:
-            for paragraph_index, paragraph in enumerate(shape.text_frame.paragraphs):
-                runs: List[Dict[str, Any]] = []
-                for run_index, run in enumerate(paragraph.runs):
-                    runs.append(_pptx_run_payload(run, run_index))
-                text_blocks.append(
-                    {
-                        "index": paragraph_index,
-                        "level": int(getattr(paragraph, "level", 0)),
-                        "text": paragraph.text or "",
-                        "runs": runs,
-                    }
-                )
-        except Exception:
-            text_blocks = []
-    payload["text_blocks"] = text_blocks
+    paragraphs, _, complete = text_walk
+    payload["text_blocks"] = paragraphs if complete else []
     if getattr(shape, "has_table", False):
         table_rows: List[List[str]] = []
         max_cols = 0
@@ -3972,7 +4157,6 @@ def _pptx_shape_payload(shape, shape_index: int) -> Dict[str, Any]:
             "col_count": max_cols,
             "rows": table_rows,
         }
-    image_ref = _pptx_image_ref(shape)
     if image_ref is not None:
         payload["image_ref"] = image_ref
         payload["has_image"] = True
@@ -3981,46 +4165,79 @@ def _pptx_shape_payload(shape, shape_index: int) -> Dict[str, Any]:
     return payload
 
 
+_PPTX_UNSTYLED_RUN_PAYLOAD: Dict[str, Any] = {
+    "index": 0,
+    "text": "",
+    "bold": None,
+    "italic": None,
+    "underline": None,
+    "size_pt": None,
+    "font_name": None,
+    "color": None,
+}
+_PPTX_RUN_STYLE_ATTRS = ("b", "i", "u", "sz")
+
+
+def _pptx_run_is_unstyled(font: Any) -> bool:
+    if font is None:
+        return True
+    rpr = getattr(font, "_rPr", None)
+    if rpr is None or len(rpr) > 0:
+        return False
+    for attr in _PPTX_RUN_STYLE_ATTRS:
+        if rpr.get(attr) is not None:
+            return False
+    return True
+
+
 def _pptx_run_payload(run, run_index: int) -> Dict[str, Any]:
     font = run.font
+    if _pptx_run_is_unstyled(font):
+        # No run-level overrides: every style field resolves to None.
+        payload = dict(_PPTX_UNSTYLED_RUN_PAYLOAD)
+        payload["index"] = run_index
+        payload["text"] = run.text or ""
+        return payload
     size_pt = None
     font_name = None
     color = None
-    if font is not None:
-        try:
-            if font.size is not None:
-                size_pt = float(font.size.pt)
-        except Exception:
-            size_pt = None
-        try:
-            font_name = font.name
-        except Exception:
-            font_name = None
-        try:
-            if font.color is not None and font.color.rgb is not None:
-                color = str(font.color.rgb)
-        except Exception:
-            color = None
+    try:
+        if font.size is not None:
+            size_pt = float(font.size.pt)
+        font_name = font.name
+        if font.color is not None and font.color.rgb is not None:
+            color = str(font.color.rgb)
+    except Exception:
+        pass
     return {
         "index": run_index,
         "text": run.text or "",
-        "bold": font.bold if font else None,
-        "italic": font.italic if font else None,
-        "underline": font.underline if font else None,
+        "bold": font.bold,
+        "italic": font.italic,
+        "underline": font.underline,
         "size_pt": size_pt,
         "font_name": font_name,
         "color": color,
     }
 
 
+_PPTX_SHAPE_TYPE_NAMES: Dict[Any, str] = {}
+
+
 def _pptx_shape_type_name(shape: Any) -> str:
     shape_type = getattr(shape, "shape_type", None)
     if shape_type is None:
         return "UNKNOWN"
+    # MSO_SHAPE_TYPE members are singletons, so this stays a handful of entries.
+    cached = _PPTX_SHAPE_TYPE_NAMES.get(shape_type)
+    if cached is not None:
+        return cached
     shape_type_name = str(shape_type)
     if hasattr(shape_type, "name"):
         shape_type_name = shape_type.name
-    return str(shape_type_name)
+    shape_type_name = str(shape_type_name)
+    _PPTX_SHAPE_TYPE_NAMES[shape_type] = shape_type_name
+    return shape_type_name
 
 
 def _pptx_rotation_value(shape: Any) -> Optional[float]:
@@ -4050,19 +4267,25 @@ def _pptx_image_ref(shape: Any) -> Optional[Dict[str, Any]]:
         return None
 
 
-def _pptx_positioned_slide_payload(slide, presentation) -> Dict[str, Any]:
+def _pptx_slide_size(presentation) -> Tuple[int, int]:
     slide_width = _pptx_length_value(getattr(presentation, "slide_width", None))
     slide_height = _pptx_length_value(getattr(presentation, "slide_height", None))
     if slide_width is None:
         slide_width = 1
     if slide_height is None:
         slide_height = 1
+    return slide_width, slide_height
+
 
+def _pptx_positioned_slide_payload(
+    slide_width: int,
+    slide_height: int,
+    positioned_items: List[Optional[Dict[str, Any]]],
+) -> Dict[str, Any]:
     positioned_shapes: List[Dict[str, Any]] = []
     missing_features: List[str] = []
     font_families: Set[str] = set()
-    for shape_index, shape in enumerate(slide.shapes):
-        item = _pptx_positioned_shape_payload(shape, shape_index, slide_width, slide_height)
+    for shape_index, item in enumerate(positioned_items):
         if item is None:
             missing_features.append(f"shape_{shape_index}_unsupported")
             continue
@@ -4081,7 +4304,14 @@ def _pptx_positioned_slide_payload(slide, presentation) -> Dict[str, Any]:
     }
 
 
-def _pptx_positioned_shape_payload(shape, shape_index: int, slide_width: int, slide_height: int) -> Optional[Dict[str, Any]]:
+def _pptx_positioned_shape_payload(
+    shape,
+    shape_index: int,
+    slide_width: int,
+    slide_height: int,
+    text_walk: Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool],
+    image_ref: Optional[Dict[str, Any]],
+) -> Optional[Dict[str, Any]]:
     left = _pptx_length_value(getattr(shape, "left", None))
     top = _pptx_length_value(getattr(shape, "top", None))
     width = _pptx_length_value(getattr(shape, "width", None))
@@ -4100,27 +4330,23 @@ def _pptx_positioned_shape_payload(shape, shape_index: int, slide_width: int, sl
     text_runs: List[Dict[str, Any]] = []
     text_blocks: List[Dict[str, Any]] = []
     plain_lines: List[str] = []
-    if getattr(shape, "has_text_frame", False):
-        try:
-            for paragraph_index, paragraph in enumerate(shape.text_frame.paragraphs):
-                paragraph_runs: List[Dict[str, Any]] = []
-                for run_index, run in enumerate(paragraph.runs):
-                    payload = _pptx_run_payload(run, run_index)
-                    payload["paragraph_index"] = paragraph_index
-                    paragraph_runs.append(payload)
-                    text_runs.append(payload)
-                block_text = paragraph.text or ""
-                plain_lines.append(block_text)
-                text_blocks.append(
-                    {
-                        "index": paragraph_index,
-                        "level": int(getattr(paragraph, "level", 0)),
-                        "text": block_text,
-                        "runs": paragraph_runs,
-                    }
-                )
-        except Exception:
-            pass
+    paragraphs, dangling_runs, _ = text_walk
+    for block in paragraphs:
+        paragraph_index = block["index"]
+        # Copy run payloads: the positioned view tags each run with its paragraph.
+        paragraph_runs = [dict(run, paragraph_index=paragraph_index) for run in block["runs"]]
+        text_runs.extend(paragraph_runs)
+        plain_lines.append(block["text"])
+        text_blocks.append(
+            {
+                "index": paragraph_index,
+                "level": block["level"],
+                "text": block["text"],
+                "runs": paragraph_runs,
+            }
+        )
+    for run in dangling_runs:
+        text_runs.append(dict(run, paragraph_index=len(paragraphs)))
 
     payload: Dict[str, Any] = {
         "index": shape_index,
@@ -4143,7 +4369,6 @@ def _pptx_positioned_shape_payload(shape, shape_index: int, slide_width: int, sl
             payload["placeholder_type"] = str(shape.placeholder_format.type)
         except Exception:
             payload["placeholder_type"] = None
-    image_ref = _pptx_image_ref(shape)
     if image_ref is not None:
         payload["image_ref"] = image_ref
         payload["has_image"] = True
@@ -4163,57 +4388,122 @@ def _pptx_length_value(length_value: Any) -> Optional[int]:
 
 # ------------------ PDF ------------------
 
+def _pdf_open_reader(path: str) -> Any:
+    # Paged clients call PdfGetMap and then PdfExtractText once per chunk, so
+    # reuse the parsed reader while the file's size and mtime are unchanged.
+    # Files modified within the racy window are always reopened.
+    st = os.stat(path)
+    if time.time_ns() - st.st_mtime_ns <= PDF_READER_RACY_WINDOW_NS:
+        return import_module("pypdf").PdfReader(path)
+    return _pdf_cached_reader(path, st.st_size, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=4)
+def _pdf_cached_reader(path: str, size: int, mtime_ns: int) -> Any:
+    return import_module("pypdf").PdfReader(path)
+
+
 def pdf_extract_text(params: Dict[str, Any]) -> Dict[str, Any]:
     """Extract text from PDF, with optional chunk_info for page-range reads."""
-    pypdf = import_module("pypdf")
     path = resolve_path(params)
-    reader = pypdf.PdfReader(path)
-    pages = params.get("pages")
-    total_pages = len(reader.pages)
-    text_parts: List[str] = []
-
-    if pages:
-        page_nums = [int(p) for p in pages]
-        for page_num in page_nums:
-            idx = page_num - 1
-            if idx < 0 or idx >= total_pages:
-                raise WorkerError("VALIDATION_FAILED", "invalid page index")
-            text_parts.append(reader.pages[idx].extract_text() or "")
-
-        total_chunks = max(1, (total_pages + PDF_CHUNK_PAGES - 1) // PDF_CHUNK_PAGES)
-        min_page = min(page_nums)
-        max_page = max(page_nums)
-        chunk_index = (min_page - 1) // PDF_CHUNK_PAGES
-        has_more = max_page < total_pages
-
-        result: Dict[str, Any] = {"text": "\n".join(text_parts)}
-        if total_chunks > 1:
-            result["chunk_info"] = {
-                "chunk_index": chunk_index,
-                "total_chunks": total_chunks,
-                "has_more": has_more,
-                "range": f"{min_page}-{max_page}",
-            }
-        return result
-    else:
-        for page in reader.pages:
-            text_parts.append(page.extract_text() or "")
-        return {"text": "\n".join(text_parts)}
+    total_pages, page_text, close = _pdf_text_source(path)
+    try:
+        pages = params.get("pages")
+        text_parts: List[str] = []
+
+        if pages:
+            page_nums = [int(p) for p in pages]
+            for page_num in page_nums:
+                idx = page_num - 1
+                if idx < 0 or idx >= total_pages:
+                    raise WorkerError("VALIDATION_FAILED", "invalid page index")
+                text_parts.append(page_text(idx))
+
+            total_chunks = max(1, (total_pages + PDF_CHUNK_PAGES - 1) // PDF_CHUNK_PAGES)
+            min_page = min(page_nums)
+            max_page = max(page_nums)
+            chunk_index = (min_page - 1) // PDF_CHUNK_PAGES
+            has_more = max_page < total_pages
+
+            result: Dict[str, Any] = {"text": "\n".join(text_parts)}
+            if total_chunks > 1:
+                result["chunk_info"] = {
+                    "chunk_index": chunk_index,
+                    "total_chunks": total_chunks,
+                    "has_more": has_more,
+                    "range": f"{min_page}-{max_page}",
+                }
+            return result
+        else:
+            for idx in range(total_pages):
+                text_parts.append(page_text(idx))
+            return {"text": "\n".join(text_parts)}
+    finally:
+        close()
+
+
+def _pdf_has_form_fields(reader: Any) -> bool:
+    # Only the catalog's /Fields array matters for the flag; get_fields()
+    # would resolve and build every field object in the form tree.
+    acro_form = reader.root_object.get("/AcroForm")
+    if acro_form is None:
+        return False
+    acro_form = acro_form.get_object()
+    if not hasattr(acro_form, "get"):
+        return False
+    fields = acro_form.get("/Fields")
+    if fields is None:
+        return False
+    fields = fields.get_object()
+    return isinstance(fields, list) and len(fields) > 0
+
+
+def _pdf_text_source(path: str) -> Tuple[int, Callable[[int], str], Callable[[], None]]:
+    """Return the page count, a page-text getter and a close callback."""
+    if PDF_TEXT_ENGINE == "pdfium":
+        pdfium = optional_module("pypdfium2")
+        if pdfium is not None:
+            doc = pdfium.PdfDocument(path)
+            return len(doc), lambda idx: _pdf_pdfium_page_text(doc, idx), doc.close
+        log_debug("pdf.pdfium_unavailable", path=path)
+    # pypdf readers are shared through _pdf_cached_reader; nothing to close.
+    pdf_pages = _pdf_open_reader(path).pages
+    return len(pdf_pages), lambda idx: _pdf_page_text(pdf_pages[idx]), lambda: None
+
+
+def _pdf_pdfium_page_text(doc: Any, idx: int) -> str:
+    # PDFium is not thread-safe, so pages are extracted one at a time; its C
+    # text layer is still several times faster than pypdf's interpreter.
+    page = doc[idx]
+    try:
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+    return text.replace("\r\n", "\n")
+
+
+def _pdf_page_text(page: Any) -> str:
+    # Pages without a content stream have no text; skip the interpreter setup.
+    if page.get("/Contents") is None:
+        return ""
+    return page.extract_text() or ""
 
 
 def pdf_get_info(params: Dict[str, Any]) -> Dict[str, Any]:
     """Get information about a PDF file including page count."""
-    pypdf = import_module("pypdf")
     path = resolve_path(params)
-    reader = pypdf.PdfReader(path)
+    reader = _pdf_open_reader(path)
     return {"page_count": len(reader.pages)}
 
 
 def pdf_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
     """Return structural map of a PDF file: page count, TOC, forms, annotations, chunks."""
-    pypdf = import_module("pypdf")
     path = resolve_path(params)
-    reader = pypdf.PdfReader(path)
+    reader = _pdf_open_reader(path)
     page_count = len(reader.pages)
 
     # Extract TOC from outlines/bookmarks
@@ -4222,7 +4512,7 @@ def pdf_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
     try:
         outlines = reader.outline
         if outlines:
-            _extract_toc_entries(outlines, reader, toc)
+            _extract_toc_entries(outlines, _pdf_page_index_map(reader), toc)
             has_toc = len(toc) > 0
     except Exception:
         pass
@@ -4230,8 +4520,7 @@ def pdf_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
     # Check for forms
     has_forms = False
     try:
-        if reader.get_fields():
-            has_forms = True
+        has_forms = _pdf_has_form_fields(reader)
     except Exception:
         pass
 
@@ -4244,17 +4533,7 @@ def pdf_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
             break
 
     # Page chunks
-    chunks: List[Dict[str, Any]] = []
-    chunk_idx = 0
-    p = 1
-    while p <= page_count:
-        end_p = min(p + PDF_CHUNK_PAGES - 1, page_count)
-        chunks.append({
-            "index": chunk_idx,
-            "pages": f"{p}-{end_p}",
-        })
-        chunk_idx += 1
-        p = end_p + 1
+    chunks = _range_chunks(page_count, PDF_CHUNK_PAGES, "pages")
 
     return {
         "page_count": page_count,
@@ -4266,11 +4545,22 @@ def pdf_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _extract_toc_entries(outlines: Any, reader: Any, toc: List[Dict[str, Any]]) -> None:
+def _pdf_page_index_map(reader: Any) -> Dict[Tuple[int, int], int]:
+    page_index_map: Dict[Tuple[int, int], int] = {}
+    for idx, page in enumerate(reader.pages):
+        ref = page.indirect_reference
+        if ref is not None:
+            page_index_map.setdefault((ref.idnum, ref.generation), idx)
+    return page_index_map
+
+
+def _extract_toc_entries(
+    outlines: Any, page_index_map: Dict[Tuple[int, int], int], toc: List[Dict[str, Any]]
+) -> None:
     """Recursively extract TOC entries from PDF outlines."""
     if isinstance(outlines, list):
         for item in outlines:
-            _extract_toc_entries(item, reader, toc)
+            _extract_toc_entries(item, page_index_map, toc)
     else:
         try:
             title = outlines.title if hasattr(outlines, 'title') else str(outlines)
@@ -4279,10 +4569,11 @@ def _extract_toc_entries(outlines: Any, reader: Any, toc: List[Dict[str, Any]])
                 # Try to get page number
                 try:
                     dest_page = outlines.page
-                    if dest_page is not None:
-                        page_idx = reader.pages.index(dest_page)
+                    ref = getattr(dest_page, "indirect_reference", None)
+                    if ref is not None:
+                        page_idx = page_index_map[(ref.idnum, ref.generation)]
                         page_num = page_idx + 1
-                except (ValueError, AttributeError):
+                except (KeyError, ValueError, AttributeError):
                     pass
             toc.append({"title": title, "page": page_num})
         except Exception:
@@ -4293,32 +4584,47 @@ def pdf_render_page(params: Dict[str, Any]) -> Dict[str, Any]:
     path = resolve_path(params)
     page_index = int(params.get("page_index", 0))
     scale = clamp_scale(params.get("scale", 1.0))
-    return render_pdf_page(path, page_index, scale)
+    image_format = parse_preview_format(params.get("format"))
+    return render_pdf_page(path, page_index, scale, image_format)
 
 
-def render_pdf_page(path: str, page_index: int, scale: float) -> Dict[str, Any]:
+def render_pdf_page(path: str, page_index: int, scale: float, image_format: str = "png") -> Dict[str, Any]:
     fitz = import_module("fitz")
     doc = fitz.open(path)
     if page_index < 0 or page_index >= doc.page_count:
         raise WorkerError("VALIDATION_FAILED", "invalid page index")
     scaled_down = False
-    png_bytes, scaled_down = _render_with_limits(doc, page_index, scale)
+    png_bytes, scaled_down = _render_with_limits(doc, page_index, scale, image_format)
     return {
         "bytes_base64": base64.b64encode(png_bytes).decode("ascii"),
         "page_count": doc.page_count,
-        "mime_type": "image/png",
+        "mime_type": PREVIEW_MIME_TYPES[image_format],
         "scaled_down": scaled_down,
     }
 
 
-def _render_with_limits(doc, page_index: int, scale: float) -> Tuple[bytes, bool]:
+def _encode_pixmap(pix, image_format: str) -> bytes:
+    if image_format == "png":
+        return pix.tobytes("png")
+    import_module("PIL.Image")
+    from PIL import Image
+
+    mode = "RGBA" if pix.alpha else "RGB"
+    image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+    out = io.BytesIO()
+    image.save(out, format="WEBP", quality=85, method=4)
+    return out.getvalue()
+
+
+def _render_with_limits(doc, page_index: int, scale: float, image_format: str = "png") -> Tuple[bytes, bool]:
     fitz = import_module("fitz")
     scaled_down = False
     current_scale = scale
+    page = doc.load_page(page_index)
     for _ in range(3):
         mat = fitz.Matrix(current_scale, current_scale)
-        pix = doc.load_page(page_index).get_pixmap(matrix=mat)
-        png_bytes = pix.tobytes("png")
+        pix = page.get_pixmap(matrix=mat, alpha=False)
+        png_bytes = _encode_pixmap(pix, image_format)
         if pix.width <= MAX_PREVIEW_DIM and pix.height <= MAX_PREVIEW_DIM and len(png_bytes) <= MAX_PREVIEW_BYTES:
             return png_bytes, scaled_down
         scaled_down = True
@@ -4351,11 +4657,23 @@ def find_preview_renderer() -> str:
     return soffice
 
 
+def _preview_renderer_profile_url() -> str:
+    # Give soffice a profile owned by this worker: it is initialized on the
+    # first conversion and reused afterwards, and it keeps conversions from
+    # attaching to (or being blocked by) a desktop LibreOffice instance.
+    global PREVIEW_PROFILE_DIR
+    if not PREVIEW_PROFILE_DIR:
+        PREVIEW_PROFILE_DIR = tempfile.mkdtemp(prefix="keenbench-soffice-profile-")
+        atexit.register(shutil.rmtree, PREVIEW_PROFILE_DIR, True)
+    return pathlib.Path(PREVIEW_PROFILE_DIR).as_uri()
+
+
 def convert_to_pdf(path: str) -> Tuple[str, str]:
     renderer = find_preview_renderer()
     tmp_dir = tempfile.mkdtemp(prefix="keenbench-preview-")
     cmd = [
         renderer,
+        "-env:UserInstallation=" + _preview_renderer_profile_url(),
         "--headless",
         "--convert-to",
         "pdf",
@@ -4376,7 +4694,9 @@ def convert_to_pdf(path: str) -> Tuple[str, str]:
     return pdf_path, tmp_dir
 
 
-def render_docx_page_fallback(path: str, page_index: int, scale: float) -> Dict[str, Any]:
+def render_docx_page_fallback(
+    path: str, page_index: int, scale: float, image_format: str = "png"
+) -> Dict[str, Any]:
     docx = import_module("docx")
     doc = docx.Document(path)
     lines: List[str] = []
@@ -4398,10 +4718,13 @@ def render_docx_page_fallback(path: str, page_index: int, scale: float) -> Dict[
         base_width=1240,
         base_height=1754,
         lines_per_page=36,
+        image_format=image_format,
     )
 
 
-def render_pptx_slide_fallback(path: str, slide_index: int, scale: float) -> Dict[str, Any]:
+def render_pptx_slide_fallback(
+    path: str, slide_index: int, scale: float, image_format: str = "png"
+) -> Dict[str, Any]:
     pptx = import_module("pptx")
     prs = pptx.Presentation(path)
     slide_count = len(prs.slides)
@@ -4431,6 +4754,7 @@ def render_pptx_slide_fallback(path: str, slide_index: int, scale: float) -> Dic
         base_width=1280,
         base_height=720,
         lines_per_page=16,
+        image_format=image_format,
     )
     return {
         "bytes_base64": render["bytes_base64"],
@@ -4447,6 +4771,7 @@ def render_text_page_preview(
     base_width: int,
     base_height: int,
     lines_per_page: int,
+    image_format: str = "png",
 ) -> Dict[str, Any]:
     import_module("PIL.Image")
     from PIL import Image, ImageDraw, ImageFont
@@ -4473,10 +4798,7 @@ def render_text_page_preview(
 
     image = Image.new("RGB", (width, height), color=(255, 255, 255))
     draw = ImageDraw.Draw(image)
-    try:
-        font = ImageFont.truetype("DejaVuSans.ttf", max(14, int(18 * scale)))
-    except Exception:
-        font = ImageFont.load_default()
+    font = _preview_font(max(14, int(18 * scale)))
 
     margin_x = max(16, int(24 * scale))
     margin_y = max(16, int(24 * scale))
@@ -4496,7 +4818,10 @@ def render_text_page_preview(
             break
 
     out = tempfile.SpooledTemporaryFile()
-    image.save(out, format="PNG")
+    if image_format == "webp":
+        image.save(out, format="WEBP", lossless=True, quality=100, method=4)
+    else:
+        image.save(out, format="PNG", compress_level=PREVIEW_PNG_COMPRESS_LEVEL, optimize=False)
     out.seek(0)
     png_bytes = out.read()
     out.close()
@@ -4506,11 +4831,21 @@ def render_text_page_preview(
     return {
         "bytes_base64": base64.b64encode(png_bytes).decode("ascii"),
         "page_count": total_pages,
-        "mime_type": "image/png",
+        "mime_type": PREVIEW_MIME_TYPES[image_format],
         "scaled_down": scaled_down,
     }
 
 
+@functools.lru_cache(maxsize=16)
+def _preview_font(size: int):
+    from PIL import ImageFont
+
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", size)
+    except Exception:
+        return ImageFont.load_default()
+
+
 def _wrap_line_for_width(draw, line: str, font, max_width: int) -> List[str]:
     text = line.strip()
     if text == "":
@@ -4518,16 +4853,30 @@ def _wrap_line_for_width(draw, line: str, font, max_width: int) -> List[str]:
     words = text.split()
     if not words:
         return [text]
+    # Pack on summed advance widths; only candidates within a space width of
+    # the limit (where bearings and kerning can tip the result) are confirmed
+    # with textbbox.
+    space_w = font.getlength(" ")
     wrapped: List[str] = []
     current = words[0]
+    current_w = font.getlength(current)
     for word in words[1:]:
-        candidate = current + " " + word
-        bbox = draw.textbbox((0, 0), candidate, font=font)
-        if bbox[2] - bbox[0] <= max_width:
-            current = candidate
+        word_w = font.getlength(word)
+        estimate = current_w + space_w + word_w
+        if estimate <= max_width - space_w:
+            fits = True
+        elif estimate > max_width + space_w:
+            fits = False
+        else:
+            bbox = draw.textbbox((0, 0), current + " " + word, font=font)
+            fits = bbox[2] - bbox[0] <= max_width
+        if fits:
+            current = current + " " + word
+            current_w = estimate
             continue
         wrapped.append(current)
         current = word
+        current_w = word_w
     wrapped.append(current)
     return wrapped
 
@@ -4581,16 +4930,67 @@ def image_render(params: Dict[str, Any]) -> Dict[str, Any]:
             "mime_type": "image/png",
             "scaled_down": False,
         }
-    with open(path, "rb") as f:
-        data = f.read()
+    if os.path.getsize(path) > MAX_PREVIEW_BYTES * 3 // 4:
+        preview = _image_downscaled_preview(path)
+        if preview is not None:
+            return {
+                "bytes_base64": base64.b64encode(preview).decode("ascii"),
+                "mime_type": "image/webp",
+                "scaled_down": True,
+            }
     return {
-        "bytes_base64": base64.b64encode(data).decode("ascii"),
+        "bytes_base64": _b64encode_file(path),
         "mime_type": _guess_mime_from_ext(ext),
         "scaled_down": False,
     }
 
 
+def _b64encode_file(path: str) -> str:
+    # Encode in 3-byte-aligned chunks so the output matches a one-shot
+    # b64encode without holding the raw file and its encoding at once.
+    encoded = bytearray()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(IMAGE_B64_CHUNK_BYTES)
+            if not chunk:
+                break
+            encoded += base64.b64encode(chunk)
+    return encoded.decode("ascii")
+
+
+def _image_downscaled_preview(path: str) -> Optional[bytes]:
+    try:
+        import_module("PIL.Image")
+        from PIL import Image
+
+        with Image.open(path) as img:
+            img.thumbnail((MAX_PREVIEW_DIM, MAX_PREVIEW_DIM), Image.Resampling.LANCZOS)
+            if img.mode not in ("RGB", "RGBA"):
+                has_alpha = "A" in img.getbands() or "transparency" in img.info
+                img = img.convert("RGBA" if has_alpha else "RGB")
+            out = io.BytesIO()
+            img.save(out, format="WEBP", quality=85, method=4)
+    except Exception:
+        return None
+    data = out.getvalue()
+    if len(data) > MAX_PREVIEW_BYTES:
+        return None
+    return data
+
+
 def _render_svg(path: str) -> bytes:
+    if SVG_RENDERER in ("auto", "pyvips"):
+        pyvips = optional_module("pyvips")
+        if pyvips is not None:
+            try:
+                image = pyvips.Image.new_from_file(path, access="sequential")
+                return image.pngsave_buffer(compression=PREVIEW_PNG_COMPRESS_LEVEL)
+            except Exception as err:
+                if SVG_RENDERER == "pyvips":
+                    raise WorkerError("FILE_READ_FAILED", "svg render failed")
+                log_debug("image.svg_pyvips_failed", path=path, error=str(err))
+        elif SVG_RENDERER == "pyvips":
+            raise WorkerError("TOOL_WORKER_UNAVAILABLE", "svg renderer not available")
     try:
         cairosvg = import_module("cairosvg")
         return cairosvg.svg2png(url=path)
@@ -4600,13 +5000,23 @@ def _render_svg(path: str) -> bytes:
         raise WorkerError("TOOL_WORKER_UNAVAILABLE", "svg renderer not available")
 
 
+_SVG_COMMENT_RE = re.compile(rb"<!--.*?-->", re.DOTALL)
+_SVG_ROOT_TAG_RE = re.compile(
+    rb"<(?![?!])[A-Za-z_][\w.:-]*((?:\s+[\w.:-]+\s*=\s*(?:\"[^\"]*\"|'[^']*'))*)\s*/?>"
+)
+_SVG_ATTR_RE = re.compile(rb"([\w.:-]+)\s*=\s*(?:\"([^\"]*)\"|'([^']*)')")
+_SVG_HEAD_SIZES = (4096, 65536)
+
+
 def _read_svg_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
     try:
-        import xml.etree.ElementTree as ET
-        tree = ET.parse(path)
-        root = tree.getroot()
-        width = root.attrib.get("width")
-        height = root.attrib.get("height")
+        attrs = _read_svg_root_attrs_from_head(path)
+        if attrs is None:
+            import xml.etree.ElementTree as ET
+            tree = ET.parse(path)
+            attrs = tree.getroot().attrib
+        width = attrs.get("width")
+        height = attrs.get("height")
         def to_int(val):
             if not val:
                 return None
@@ -4622,6 +5032,35 @@ def _read_svg_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
         return None, None
 
 
+def _read_svg_root_attrs_from_head(path: str) -> Optional[Dict[str, str]]:
+    # The root element's attributes sit at the top of the file, so scan a
+    # bounded head instead of parsing the whole document. Anything the regex
+    # cannot read the way a parser would (entities, non-UTF-8 encodings,
+    # unterminated comments) returns None so the caller falls back to ET.
+    with open(path, "rb") as f:
+        head = b""
+        for size in _SVG_HEAD_SIZES:
+            head += f.read(size - len(head))
+            cleaned = _SVG_COMMENT_RE.sub(b"", head)
+            if b"<!--" in cleaned:
+                continue
+            match = _SVG_ROOT_TAG_RE.search(cleaned)
+            if match is None:
+                continue
+            attrs: Dict[str, str] = {}
+            for name, dq_value, sq_value in _SVG_ATTR_RE.findall(match.group(1)):
+                value = dq_value if dq_value or not sq_value else sq_value
+                if b"&" in value:
+                    return None
+                try:
+                    text = value.decode("utf-8")
+                except UnicodeDecodeError:
+                    return None
+                attrs[name.decode("ascii")] = re.sub(r"\r\n|[\t\n\r]", " ", text)
+            return attrs
+    return None
+
+
 def _guess_mime_from_ext(ext: str) -> str:
     if ext == ".png":
         return "image/png"
@@ -4641,24 +5080,21 @@ def _guess_mime_from_ext(ext: str) -> str:
 def text_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
     """Return structural map of a text file: line count, char count, chunks."""
     path = resolve_path(params)
+    # Count in fixed-size decoded chunks; text mode keeps universal-newline and
+    # replacement semantics identical to reading the whole file at once.
+    newline_count = 0
+    char_count = 0
     with open(path, "r", encoding="utf-8", errors="replace") as f:
-        content = f.read()
-    lines = content.split("\n")
-    line_count = len(lines)
-    char_count = len(content)
+        while True:
+            chunk = f.read(TEXT_READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            newline_count += chunk.count("\n")
+            char_count += len(chunk)
+    line_count = newline_count + 1
 
     # Chunks of TEXT_CHUNK_LINES lines
-    chunks: List[Dict[str, Any]] = []
-    chunk_idx = 0
-    ln = 1
-    while ln <= line_count:
-        end_ln = min(ln + TEXT_CHUNK_LINES - 1, line_count)
-        chunks.append({
-            "index": chunk_idx,
-            "lines": f"{ln}-{end_ln}",
-        })
-        chunk_idx += 1
-        ln = end_ln + 1
+    chunks = _range_chunks(line_count, TEXT_CHUNK_LINES, "lines")
 
     return {
         "line_count": line_count,
@@ -4670,14 +5106,33 @@ def text_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
 def text_read_lines(params: Dict[str, Any]) -> Dict[str, Any]:
     """Read a range of lines from a text file with chunk_info."""
     path = resolve_path(params)
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        all_lines = f.readlines()
-    total_lines = len(all_lines)
     line_start = int(params.get("line_start", 1))
     line_count = int(params.get("line_count", TEXT_CHUNK_LINES))
 
     if line_start < 1:
         line_start = 1
+    window_end = line_start + line_count - 1
+    # Keep only the requested window; lines past it are counted in bulk for total_lines.
+    window_lines: List[str] = []
+    total_lines = 0
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            total_lines += 1
+            if line_start <= total_lines <= window_end:
+                window_lines.append(line)
+            if total_lines >= window_end:
+                break
+        trailing_newlines = 0
+        last_char = ""
+        while True:
+            chunk = f.read(TEXT_READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            trailing_newlines += chunk.count("\n")
+            last_char = chunk[-1]
+        if last_char:
+            total_lines += trailing_newlines + (0 if last_char == "\n" else 1)
+
     if line_start > total_lines:
         return {
             "text": "",
@@ -4689,8 +5144,20 @@ def text_read_lines(params: Dict[str, Any]) -> Dict[str, Any]:
             },
         }
 
-    end_line = min(line_start + line_count - 1, total_lines)
-    text = "".join(all_lines[line_start - 1 : end_line])
+    if window_end < 0:
+        # A negative line_count ends the window relative to the file tail
+        # (list-slice semantics), which needs total_lines: take a second pass.
+        stop = total_lines + window_end
+        window_lines = []
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for idx, line in enumerate(f):
+                if idx >= stop:
+                    break
+                if idx >= line_start - 1:
+                    window_lines.append(line)
+
+    end_line = min(window_end, total_lines)
+    text = "".join(window_lines)
 
     total_chunks = max(1, (total_lines + TEXT_CHUNK_LINES - 1) // TEXT_CHUNK_LINES)
     chunk_index = (line_start - 1) // TEXT_CHUNK_LINES
@@ -4708,22 +5175,38 @@ def text_read_lines(params: Dict[str, Any]) -> Dict[str, Any]:
 
 # ------------------ TABULAR (CSV) ------------------
 
-def _tabular_source_signature(path: str) -> Dict[str, Any]:
+def _tabular_stat_signature(path: str) -> Dict[str, Any]:
     stat = os.stat(path)
-    hasher = hashlib.sha256()
-    with open(path, "rb") as handle:
-        while True:
-            chunk = handle.read(1024 * 1024)
-            if not chunk:
-                break
-            hasher.update(chunk)
     return {
         "size_bytes": int(stat.st_size),
         "mtime_ns": int(getattr(stat, "st_mtime_ns", int(stat.st_mtime * 1_000_000_000))),
-        "sha256": hasher.hexdigest(),
     }
 
 
+def _tabular_source_signature(path: str) -> Dict[str, Any]:
+    signature = _tabular_stat_signature(path)
+    signature["sha256"] = _file_sha256(path)
+    return signature
+
+
+def _file_sha256(path: str) -> str:
+    with open(path, "rb") as handle:
+        file_digest = getattr(hashlib, "file_digest", None)
+        if callable(file_digest):
+            # Python 3.11+: hashes straight from the fd in C without per-chunk bytes objects.
+            hasher = file_digest(handle, "sha256")
+        else:
+            hasher = hashlib.sha256()
+            buffer = bytearray(TABULAR_HASH_CHUNK_BYTES)
+            view = memoryview(buffer)
+            while True:
+                size = handle.readinto(buffer)
+                if not size:
+                    break
+                hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
 def _tabular_cache_key(rel_path: str) -> str:
     normalized = str(rel_path or "").strip().lower()
     return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
@@ -4775,18 +5258,16 @@ def _tabular_cache_is_fresh(
         return False
     if source.get("path") != rel_path:
         return False
+    # Signature fields that are absent are not compared: a stat-only signature
+    # skips the hash, a content-only signature skips mtime.
     try:
-        size_bytes = int(source.get("size_bytes", -1))
-        mtime_ns = int(source.get("mtime_ns", -1))
-        sig_size = int(source_sig.get("size_bytes", -2))
-        sig_mtime = int(source_sig.get("mtime_ns", -2))
+        if int(source.get("size_bytes", -1)) != int(source_sig.get("size_bytes", -2)):
+            return False
+        if "mtime_ns" in source_sig and int(source.get("mtime_ns", -1)) != int(source_sig.get("mtime_ns", -2)):
+            return False
     except Exception:
         return False
-    if size_bytes != sig_size:
-        return False
-    if mtime_ns != sig_mtime:
-        return False
-    if str(source.get("sha256") or "") != str(source_sig.get("sha256") or ""):
+    if "sha256" in source_sig and str(source.get("sha256") or "") != str(source_sig.get("sha256") or ""):
         return False
     if not os.path.isfile(db_path):
         return False
@@ -4797,6 +5278,7 @@ def _tabular_cache_is_fresh(
 
 
 def _tabular_remove_cache_files(db_path: str, metadata_path: str) -> None:
+    _tabular_discard_connection(db_path)
     for suffix in ("", ".wal"):
         target = db_path + suffix
         if os.path.exists(target):
@@ -4849,20 +5331,12 @@ def _tabular_detect_encoding(path: str) -> Tuple[str, float]:
             bom = handle.read(3)
     except Exception:
         bom = b""
-    if bom.startswith(b"\xef\xbb\xbf"):
-        try:
-            if _tabular_can_decode(path, "utf-8-sig"):
-                return "utf-8-sig", 1.0
-        except Exception:
-            pass
-    try:
-        if _tabular_can_decode(path, "utf-8"):
-            return "utf-8", 1.0
-    except Exception:
-        pass
+    # utf-8-sig only differs from utf-8 by skipping a leading BOM, so one
+    # strict pass decides both; the BOM picks which name to report.
     try:
         if _tabular_can_decode(path, "utf-8-sig"):
-            return "utf-8-sig", 1.0
+            has_bom = bom != b"" and b"\xef\xbb\xbf".startswith(bom)
+            return ("utf-8-sig" if has_bom else "utf-8"), 1.0
     except Exception:
         pass
 
@@ -4890,6 +5364,65 @@ def _tabular_open_connection(db_path: str, read_only: bool = False):
     return conn
 
 
+# Read-only connections kept open between requests, most recently used last.
+# Each entry remembers the cache file it was opened on so a rebuilt or
+# replaced file is never read through a stale handle.
+_TABULAR_CONNECTION_POOL: Dict[str, Tuple[Tuple[int, int, int], Any]] = {}
+_TABULAR_CONNECTION_POOL_LOCK = threading.Lock()
+
+
+def _tabular_db_signature(db_path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return int(stat.st_ino), int(stat.st_size), int(stat.st_mtime_ns)
+
+
+def _tabular_close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def _tabular_acquire_connection(db_path: str):
+    """Check out a read-only connection, reusing a pooled one when the cache file is unchanged."""
+    with _TABULAR_CONNECTION_POOL_LOCK:
+        entry = _TABULAR_CONNECTION_POOL.pop(db_path, None)
+    if entry is not None:
+        signature, conn = entry
+        if signature == _tabular_db_signature(db_path):
+            return conn
+        _tabular_close_quietly(conn)
+    return _tabular_open_connection(db_path, read_only=True)
+
+
+def _tabular_release_connection(db_path: str, conn: Any) -> None:
+    signature = _tabular_db_signature(db_path)
+    if TABULAR_CONNECTION_POOL_SIZE <= 0 or signature is None:
+        _tabular_close_quietly(conn)
+        return
+    evicted: List[Any] = []
+    with _TABULAR_CONNECTION_POOL_LOCK:
+        previous = _TABULAR_CONNECTION_POOL.pop(db_path, None)
+        if previous is not None:
+            evicted.append(previous[1])
+        _TABULAR_CONNECTION_POOL[db_path] = (signature, conn)
+        while len(_TABULAR_CONNECTION_POOL) > TABULAR_CONNECTION_POOL_SIZE:
+            oldest = next(iter(_TABULAR_CONNECTION_POOL))
+            evicted.append(_TABULAR_CONNECTION_POOL.pop(oldest)[1])
+    for stale in evicted:
+        _tabular_close_quietly(stale)
+
+
+def _tabular_discard_connection(db_path: str) -> None:
+    with _TABULAR_CONNECTION_POOL_LOCK:
+        entry = _TABULAR_CONNECTION_POOL.pop(db_path, None)
+    if entry is not None:
+        _tabular_close_quietly(entry[1])
+
+
 def _tabular_try_set_statement(conn: Any, statements: List[str]) -> bool:
     for statement in statements:
         try:
@@ -4985,13 +5518,21 @@ def _tabular_invalidate_cache_for_rel_path(workbench_id: str, rel_path: str) ->
     _tabular_remove_cache_files(db_path, metadata_path)
 
 
+_ASCII_NON_ALNUM_TABLE = str.maketrans("", "", "".join(chr(c) for c in range(128) if not chr(c).isalnum()))
+
+
 def _tabular_normalize_key(value: Any) -> str:
-    return "".join(ch for ch in str(value or "").lower() if ch.isalnum())
+    text = str(value or "").lower()
+    if text.isascii():
+        return text.translate(_ASCII_NON_ALNUM_TABLE)
+    return "".join(ch for ch in text if ch.isalnum())
 
 
 def _tabular_sniff_csv(conn: Any, source_path: str) -> Dict[str, Any]:
     try:
-        cursor = conn.execute("SELECT * FROM sniff_csv(?, sample_size=-1)", [source_path])
+        cursor = conn.execute(
+            "SELECT * FROM sniff_csv(?, sample_size=?)", [source_path, TABULAR_SNIFF_SAMPLE_ROWS]
+        )
         row = cursor.fetchone()
         if row is None:
             return {"delimiter": ",", "quote_char": '"', "has_header": True}
@@ -5081,11 +5622,45 @@ def _tabular_validate_source(params: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def _tabular_rebuild_cache(source: Dict[str, Any], db_path: str, metadata_path: str, source_sig: Dict[str, Any]) -> Dict[str, Any]:
+def _tabular_cached_encoding(
+    previous: Optional[Dict[str, Any]],
+    source_sig: Dict[str, Any],
+) -> Optional[Tuple[str, float]]:
+    """Return the encoding recorded for byte-identical source content, if any."""
+    if not isinstance(previous, dict):
+        return None
+    prev_source = previous.get("source")
+    encoding = previous.get("encoding_detected")
+    if not isinstance(prev_source, dict) or not isinstance(encoding, str) or not encoding:
+        return None
+    try:
+        if int(prev_source.get("size_bytes", -1)) != int(source_sig.get("size_bytes", -2)):
+            return None
+    except Exception:
+        return None
+    sha256 = str(source_sig.get("sha256") or "")
+    if not sha256 or str(prev_source.get("sha256") or "") != sha256:
+        return None
+    return encoding, _tabular_normalize_confidence(previous.get("encoding_confidence"))
+
+
+def _tabular_rebuild_cache(
+    source: Dict[str, Any],
+    db_path: str,
+    metadata_path: str,
+    source_sig: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
     _tabular_remove_cache_files(db_path, metadata_path)
 
-    encoding, confidence = _tabular_detect_encoding(source["source_path"])
+    # Detection decodes the whole file (up to three passes plus charset_normalizer);
+    # skip it when the previous cache saw the same bytes.
+    cached_encoding = _tabular_cached_encoding(previous, source_sig)
+    if cached_encoding is not None:
+        encoding, confidence = cached_encoding
+    else:
+        encoding, confidence = _tabular_detect_encoding(source["source_path"])
     conn = _tabular_open_connection(db_path, read_only=False)
     try:
         sniff = _tabular_sniff_csv(conn, source["source_path"])
@@ -5133,13 +5708,36 @@ def _tabular_rebuild_cache(source: Dict[str, Any], db_path: str, metadata_path:
     return metadata
 
 
+def _tabular_stat_is_racy(stat_sig: Dict[str, Any], metadata_path: str) -> bool:
+    # Like git's racy-index check: a source modified close to when the cache was
+    # written may have changed again within the filesystem's mtime granularity.
+    try:
+        metadata_mtime_ns = int(os.stat(metadata_path).st_mtime_ns)
+    except Exception:
+        return True
+    return int(stat_sig["mtime_ns"]) + TABULAR_RACY_WINDOW_NS >= metadata_mtime_ns
+
+
 def _tabular_ensure_cache(params: Dict[str, Any]) -> Dict[str, Any]:
     source = _tabular_validate_source(params)
-    source_sig = _tabular_source_signature(source["source_path"])
     db_path, metadata_path = _tabular_cache_paths(source["workbench_id"], source["rel_path"])
     metadata = _tabular_load_metadata(metadata_path)
-    if not isinstance(metadata, dict) or not _tabular_cache_is_fresh(metadata, source["rel_path"], source_sig, db_path):
-        metadata = _tabular_rebuild_cache(source, db_path, metadata_path, source_sig)
+    rel_path = source["rel_path"]
+    fresh = False
+    if isinstance(metadata, dict):
+        stat_sig = _tabular_stat_signature(source["source_path"])
+        if not _tabular_stat_is_racy(stat_sig, metadata_path):
+            # Unchanged size and mtime_ns: trust the cache without hashing the file.
+            fresh = _tabular_cache_is_fresh(metadata, rel_path, stat_sig, db_path)
+    if not fresh:
+        source_sig = _tabular_source_signature(source["source_path"])
+        content_sig = {"size_bytes": source_sig["size_bytes"], "sha256": source_sig["sha256"]}
+        if isinstance(metadata, dict) and _tabular_cache_is_fresh(metadata, rel_path, content_sig, db_path):
+            # Same bytes under a new mtime (touch, re-save): keep the table, refresh the stamp.
+            metadata["source"]["mtime_ns"] = int(source_sig["mtime_ns"])
+            _tabular_write_metadata(metadata_path, metadata)
+        else:
+            metadata = _tabular_rebuild_cache(source, db_path, metadata_path, source_sig, metadata)
     return {
         "db_path": db_path,
         "metadata_path": metadata_path,
@@ -5156,20 +5754,22 @@ def _tabular_quote_literal(value: str) -> str:
     return "'" + value.replace("'", "''") + "'"
 
 
-def _tabular_count_distinct_aggregates(conn: Any, columns: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
-    if len(columns) == 0:
-        return {}
-
+@functools.lru_cache(maxsize=64)
+def _tabular_count_distinct_sql(names: Tuple[str, ...]) -> str:
     select_items: List[str] = []
-    names: List[str] = []
-    for index, col in enumerate(columns):
-        name = str(col.get("name") or "")
+    for index, name in enumerate(names):
         ident = _tabular_quote_ident(name)
         select_items.append(f"COUNT({ident}) AS non_null_{index}")
         select_items.append(f"COALESCE(approx_count_distinct({ident}), 0) AS distinct_{index}")
-        names.append(name)
+    return f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}"
+
 
-    row = conn.execute(f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
+def _tabular_count_distinct_aggregates(conn: Any, columns: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    if len(columns) == 0:
+        return {}
+
+    names = [str(col.get("name") or "") for col in columns]
+    row = conn.execute(_tabular_count_distinct_sql(tuple(names))).fetchone()
     values = list(row or [])
 
     out: Dict[str, Dict[str, int]] = {}
@@ -5185,25 +5785,29 @@ def _tabular_count_distinct_aggregates(conn: Any, columns: List[Dict[str, Any]])
 
 
 def _tabular_json_value(value: Any) -> Any:
+    handler = _TABULAR_JSON_HANDLERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+    return _tabular_json_value_slow(value)
+
+
+def _tabular_json_value_slow(value: Any) -> Any:
+    # Subclasses and foreign scalar types (numpy, etc.) miss the exact-type
+    # table in _tabular_json_value and land here.
     if value is None or isinstance(value, (bool, int, str)):
         return value
     if isinstance(value, float):
-        return value if math.isfinite(value) else None
+        return _tabular_json_float(value)
     if isinstance(value, decimal.Decimal):
-        if not value.is_finite():
-            return None
-        as_int = value.to_integral_value()
-        if value == as_int:
-            return int(as_int)
-        return float(value)
+        return _tabular_json_decimal(value)
     if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
         return value.isoformat()
     if isinstance(value, bytes):
-        return base64.b64encode(value).decode("ascii")
+        return _tabular_json_bytes(value)
     if isinstance(value, (list, tuple)):
-        return [_tabular_json_value(item) for item in value]
+        return _tabular_json_list(value)
     if isinstance(value, dict):
-        return {str(key): _tabular_json_value(val) for key, val in value.items()}
+        return _tabular_json_dict(value)
     item = getattr(value, "item", None)
     if callable(item):
         try:
@@ -5213,31 +5817,107 @@ def _tabular_json_value(value: Any) -> Any:
     return str(value)
 
 
+def _tabular_json_identity(value: Any) -> Any:
+    return value
+
+
+def _tabular_json_float(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+def _tabular_json_decimal(value: decimal.Decimal) -> Any:
+    if not value.is_finite():
+        return None
+    as_int = value.to_integral_value()
+    if value == as_int:
+        return int(as_int)
+    return float(value)
+
+
+def _tabular_json_isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _tabular_json_bytes(value: bytes) -> str:
+    if not value:
+        return ""
+    # b2a_base64 is what base64.b64encode wraps; calling it directly skips
+    # that layer for every blob cell.
+    return binascii.b2a_base64(value, newline=False).decode("ascii")
+
+
+def _tabular_json_list(value: Any) -> List[Any]:
+    return [_tabular_json_value(item) for item in value]
+
+
+def _tabular_json_dict(value: Dict[Any, Any]) -> Dict[str, Any]:
+    return {str(key): _tabular_json_value(val) for key, val in value.items()}
+
+
+_TABULAR_JSON_HANDLERS: Dict[type, Callable[[Any], Any]] = {
+    type(None): _tabular_json_identity,
+    bool: _tabular_json_identity,
+    int: _tabular_json_identity,
+    str: _tabular_json_identity,
+    float: _tabular_json_float,
+    decimal.Decimal: _tabular_json_decimal,
+    datetime.datetime: _tabular_json_isoformat,
+    datetime.date: _tabular_json_isoformat,
+    datetime.time: _tabular_json_isoformat,
+    bytes: _tabular_json_bytes,
+    list: _tabular_json_list,
+    tuple: _tabular_json_list,
+    dict: _tabular_json_dict,
+}
+
+
+# DuckDB result types whose Python values (bool/int/str/None) are already
+# JSON-safe, so their cells can skip _tabular_json_value.
+_TABULAR_JSON_PASSTHROUGH_TYPES = frozenset({
+    "BOOLEAN", "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT", "VARCHAR",
+})
+
+
+def _tabular_json_convert_positions(db_types: Iterable[Any]) -> List[int]:
+    return [
+        index for index, db_type in enumerate(db_types)
+        if str(db_type or "").upper() not in _TABULAR_JSON_PASSTHROUGH_TYPES
+    ]
+
+
+def _tabular_json_rows(
+    rows: List[Any],
+    db_types: List[Any],
+    convert_positions: Optional[List[int]] = None,
+) -> List[List[Any]]:
+    if convert_positions is None:
+        convert_positions = _tabular_json_convert_positions(db_types)
+    out: List[List[Any]] = []
+    for row in rows:
+        values = list(row)
+        for index in convert_positions:
+            if index < len(values):
+                values[index] = _tabular_json_value(values[index])
+        out.append(values)
+    return out
+
+
 def _tabular_chunks(total_rows: int, chunk_rows: int = TABULAR_CHUNK_ROWS) -> List[Dict[str, Any]]:
-    chunks: List[Dict[str, Any]] = []
-    if total_rows <= 0:
-        return chunks
-    start = 1
-    index = 0
-    while start <= total_rows:
-        end = min(start + chunk_rows - 1, total_rows)
-        chunks.append({"index": index, "rows": f"{start}-{end}"})
-        index += 1
-        start = end + 1
-    return chunks
+    return _range_chunks(total_rows, chunk_rows, "rows")
 
 
 def _tabular_selected_columns(params: Dict[str, Any], schema: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    schema_by_name: Dict[str, Dict[str, Any]] = {}
-    for col in schema:
-        schema_by_name[str(col.get("name"))] = col
-
     requested = params.get("columns")
     if requested is None:
         return list(schema)
     if not isinstance(requested, list) or len(requested) == 0:
         raise WorkerError("VALIDATION_FAILED", "columns must be a non-empty list")
 
+    schema_by_name: Dict[str, Dict[str, Any]] = {}
+    for col in schema:
+        schema_by_name[str(col.get("name"))] = col
+
     selected: List[Dict[str, Any]] = []
     seen: Set[str] = set()
     for raw in requested:
@@ -5280,67 +5960,29 @@ def _tabular_parse_non_negative_int(value: Any, name: str, default: int) -> int:
     return parsed
 
 
+# One alternative per masked construct; text between matches is kept as is.
+# Unterminated literals and comments run to the end of the query.
+_SQL_LITERAL_OR_COMMENT_RE = re.compile(
+    r"'(?:''|[^'])*(?:'|\Z)"
+    r'|"(?:""|[^"])*(?:"|\Z)'
+    r"|--[^\n]*"
+    r"|/\*.*?(?:\*/|\Z)",
+    re.DOTALL,
+)
+
+
+def _tabular_mask_sql_token(match: Any) -> str:
+    token = match.group()
+    if token[0] in "'\"":
+        return " "
+    if token[0] == "/":
+        # Keep line breaks from block comments so statements stay separated.
+        return "\n" * token.count("\n")
+    return ""
+
+
 def _tabular_strip_sql_literals_and_comments(sql: str) -> str:
-    out: List[str] = []
-    state = "normal"
-    i = 0
-    while i < len(sql):
-        ch = sql[i]
-        nxt = sql[i + 1] if i + 1 < len(sql) else ""
-        if state == "normal":
-            if ch == "'" and state == "normal":
-                state = "single_quote"
-                out.append(" ")
-                i += 1
-                continue
-            if ch == '"' and state == "normal":
-                state = "double_quote"
-                out.append(" ")
-                i += 1
-                continue
-            if ch == "-" and nxt == "-":
-                state = "line_comment"
-                i += 2
-                continue
-            if ch == "/" and nxt == "*":
-                state = "block_comment"
-                i += 2
-                continue
-            out.append(ch)
-            i += 1
-            continue
-        if state == "single_quote":
-            if ch == "'" and nxt == "'":
-                i += 2
-                continue
-            if ch == "'":
-                state = "normal"
-            i += 1
-            continue
-        if state == "double_quote":
-            if ch == '"' and nxt == '"':
-                i += 2
-                continue
-            if ch == '"':
-                state = "normal"
-            i += 1
-            continue
-        if state == "line_comment":
-            if ch == "\n":
-                state = "normal"
-                out.append("\n")
-            i += 1
-            continue
-        if state == "block_comment":
-            if ch == "*" and nxt == "/":
-                state = "normal"
-                i += 2
-                continue
-            if ch == "\n":
-                out.append("\n")
-            i += 1
-            continue
-    return "".join(out)
+    return _SQL_LITERAL_OR_COMMENT_RE.sub(_tabular_mask_sql_token, sql)
 
 
 # Keywords that, as SQL statements, could modify data or escape the sandbox.
@@ -5350,6 +5992,9 @@ _DANGEROUS_KEYWORDS = frozenset({
     "vacuum", "analyze", "grant", "revoke", "comment", "install",
     "load", "export", "import", "merge",
 })
+# Every keyword token is delimited by whitespace or punctuation, so a query
+# without any of these whole words cannot contain one in statement position.
+_DANGEROUS_PRESENCE_RE = re.compile(r"\b(?:" + "|".join(sorted(_DANGEROUS_KEYWORDS)) + r")\b")
 
 # Tokens after which the next bare word is most likely an identifier (column
 # name, table name, alias) rather than a SQL statement keyword.  This lets
@@ -5369,36 +6014,62 @@ _IDENT_CONTEXT_TOKENS = frozenset({
     "|", "&", "^", "~", "%",
 })
 
-_TOKEN_SPLIT_RE = re.compile(r"(\s+|[,;.()\[\]=<>!+\-*/|&^~%])")
+# A token is a single punctuation character or a run of anything else that is
+# neither whitespace nor punctuation.
+_SQL_TOKEN_RE = re.compile(r"[,;.()\[\]=<>!+\-*/|&^~%]|[^\s,;.()\[\]=<>!+\-*/|&^~%]+")
+_SQL_LEADING_WORD_RE = re.compile(r"[A-Za-z]+")
 
 
 def _tabular_find_dangerous_keyword(lowered_sql: str) -> Optional[str]:
     """Return a dangerous keyword found in *statement* position, or None.
 
-    Splits the (already-stripped, lowered) SQL into tokens and skips keywords
-    that appear right after a token that normally introduces an identifier
+    Tokenizes the (already-stripped, lowered) SQL and skips keywords that
+    appear right after a token that normally introduces an identifier
     (SELECT, FROM, comma, dot, operators, …).
     """
-    parts = _TOKEN_SPLIT_RE.split(lowered_sql)
-    tokens = [p for p in parts if p.strip()]
-    prev = None
-    for token in tokens:
+    if _DANGEROUS_PRESENCE_RE.search(lowered_sql) is None:
+        return None
+    prev_is_context = False
+    for token in _SQL_TOKEN_RE.findall(lowered_sql):
         if token in _DANGEROUS_KEYWORDS:
-            if prev is not None and prev in _IDENT_CONTEXT_TOKENS:
-                prev = token
-                continue
-            return token
-        prev = token
+            if not prev_is_context:
+                return token
+            prev_is_context = False
+        else:
+            prev_is_context = token in _IDENT_CONTEXT_TOKENS
     return None
 
 
+# Table functions that read files or URLs. Each alternative is anchored at a
+# word start and cannot run past the identifier, so a search stays linear;
+# splitting call sites out and classifying names in Python measured slower.
+_PATH_FUNCTION_RE = re.compile(
+    r"\b(read_[a-z0-9_]+|[a-z0-9_]+_scan|glob|open_url|httpfs|read_csv|read_parquet|read_json)\s*\("
+)
+
+
 def _tabular_validate_query(raw_query: Any) -> str:
     if raw_query is None:
         raise WorkerError("VALIDATION_FAILED", "missing query")
     query = str(raw_query).strip()
     if not query:
         raise WorkerError("VALIDATION_FAILED", "missing query")
-
+    # Reject obvious non-SELECT statements before stripping literals. Comments
+    # and literals can only follow the leading word, so once that word cannot
+    # grow into select/with the full check would fail the same way; with a
+    # ';' present the single-statement errors take precedence instead.
+    leading = _SQL_LEADING_WORD_RE.match(query)
+    if leading is not None and ";" not in query:
+        word = leading.group(0).lower()
+        if not ("select".startswith(word) or "with".startswith(word)):
+            raise WorkerError("VALIDATION_FAILED", "only SELECT/CTE queries are allowed")
+    return _tabular_validate_query_text(query)
+
+
+# Paging through a result re-sends the same SQL with a new window_offset, so
+# remember queries that passed; rejected ones raise and are never cached.
+@functools.lru_cache(maxsize=256)
+def _tabular_validate_query_text(query: str) -> str:
     checked = _tabular_strip_sql_literals_and_comments(query).strip()
     if not checked:
         raise WorkerError("VALIDATION_FAILED", "invalid query")
@@ -5424,10 +6095,7 @@ def _tabular_validate_query(raw_query: Any) -> str:
     dangerous_kw = _tabular_find_dangerous_keyword(lowered)
     if dangerous_kw is not None:
         raise WorkerError("VALIDATION_FAILED", "query must be read-only")
-    if re.search(
-        r"\b(read_[a-z0-9_]+|[a-z0-9_]+_scan|glob|open_url|httpfs|read_csv|read_parquet|read_json)\s*\(",
-        lowered,
-    ):
+    if _PATH_FUNCTION_RE.search(lowered) is not None:
         raise WorkerError("VALIDATION_FAILED", "path-reading functions are not allowed")
 
     return query
@@ -5459,7 +6127,7 @@ def tabular_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
                 "inferred_type": str(col.get("inferred_type") or "string"),
             }
         )
-    return {
+    result: Dict[str, Any] = {
         "format": "csv",
         "delimiter": str(metadata.get("delimiter") or ","),
         "quote_char": str(metadata.get("quote_char") or '"'),
@@ -5469,8 +6137,12 @@ def tabular_get_map(params: Dict[str, Any]) -> Dict[str, Any]:
         "row_count": row_count,
         "column_count": len(out_columns),
         "columns": out_columns,
-        "chunks": _tabular_chunks(row_count, TABULAR_CHUNK_ROWS),
+        "chunk_rows": TABULAR_CHUNK_ROWS,
+        "total_chunks": (row_count + TABULAR_CHUNK_ROWS - 1) // TABULAR_CHUNK_ROWS,
     }
+    if _coerce_bool_strict(params.get("include_chunks"), True):
+        result["chunks"] = _tabular_chunks(row_count, TABULAR_CHUNK_ROWS)
+    return result
 
 
 def tabular_describe(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -5479,7 +6151,7 @@ def tabular_describe(params: Dict[str, Any]) -> Dict[str, Any]:
     schema = metadata.get("columns") or []
     row_count = int(metadata.get("row_count", 0))
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
+    conn = _tabular_acquire_connection(cache["db_path"])
     try:
         counts_by_name = _tabular_count_distinct_aggregates(conn, schema)
         columns_out: List[Dict[str, Any]] = []
@@ -5499,7 +6171,7 @@ def tabular_describe(params: Dict[str, Any]) -> Dict[str, Any]:
                 }
             )
     finally:
-        conn.close()
+        _tabular_release_connection(cache["db_path"], conn)
 
     return {
         "row_count": row_count,
@@ -5515,167 +6187,120 @@ def tabular_get_stats(params: Dict[str, Any]) -> Dict[str, Any]:
     selected = _tabular_selected_columns(params, schema)
     row_count = int(metadata.get("row_count", 0))
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
+    conn = _tabular_acquire_connection(cache["db_path"])
     try:
-        counts_by_name = _tabular_count_distinct_aggregates(conn, selected)
-
         selected_meta: List[Dict[str, Any]] = []
         out_columns: List[Dict[str, Any]] = []
-        numeric_positions: List[int] = []
-        date_positions: List[int] = []
-        boolean_positions: List[int] = []
         text_positions: List[int] = []
+        # Every scalar aggregate for every selected column goes into one SELECT
+        # so DuckDB scans the table once; slots map result positions back to
+        # (column index, output key, converter).
+        select_items: List[str] = []
+        slots: List[Tuple[int, str, Callable[[Any], Any]]] = []
 
+        def add_aggregate(index: int, key: str, expr: str, convert: Callable[[Any], Any]) -> None:
+            select_items.append(f"{expr} AS {key}_{index}")
+            slots.append((index, key, convert))
+
+        def to_count(value: Any) -> int:
+            return int(value or 0)
+
+        common_select_items: List[str] = []
         for index, col in enumerate(selected):
             col_name = str(col.get("name") or "")
             inferred_type = str(col.get("inferred_type") or "string")
-            counts = counts_by_name.get(col_name) or {}
-            non_null_count = int(counts.get("non_null_count", 0))
-            distinct_estimate = int(counts.get("distinct_estimate", 0))
-            item: Dict[str, Any] = {
-                "name": col_name,
-                "type": inferred_type,
-                "non_null_count": non_null_count,
-                "distinct_estimate": distinct_estimate,
-            }
+            ident = _tabular_quote_ident(col_name)
+            family = _tabular_type_family(inferred_type)
             selected_meta.append(
                 {
                     "index": index,
                     "name": col_name,
-                    "ident": _tabular_quote_ident(col_name),
-                    "family": _tabular_type_family(inferred_type),
+                    "ident": ident,
+                    "family": family,
                 }
             )
-            out_columns.append(item)
-
-        for meta in selected_meta:
-            if meta["family"] == "numeric":
-                numeric_positions.append(meta["index"])
-            elif meta["family"] == "date":
-                date_positions.append(meta["index"])
-            elif meta["family"] == "boolean":
-                boolean_positions.append(meta["index"])
-            else:
-                text_positions.append(meta["index"])
-
-        if len(numeric_positions) > 0:
-            select_items: List[str] = []
-            for index in numeric_positions:
-                ident = str(selected_meta[index]["ident"])
-                select_items.extend(
-                    [
-                        f"MIN({ident}) AS min_{index}",
-                        f"MAX({ident}) AS max_{index}",
-                        f"AVG({ident}) AS mean_{index}",
-                        f"SUM({ident}) AS sum_{index}",
-                        f"STDDEV_SAMP({ident}) AS stddev_{index}",
-                    ]
+            out_columns.append(
+                {
+                    "name": col_name,
+                    "type": inferred_type,
+                    "non_null_count": 0,
+                    "distinct_estimate": 0,
+                }
+            )
+            add_aggregate(index, "non_null_count", f"COUNT({ident})", to_count)
+            add_aggregate(
+                index, "distinct_estimate", f"COALESCE(approx_count_distinct({ident}), 0)", to_count
+            )
+            if family == "numeric":
+                add_aggregate(index, "min", f"MIN({ident})", _tabular_json_value)
+                add_aggregate(index, "max", f"MAX({ident})", _tabular_json_value)
+                add_aggregate(index, "mean", f"AVG({ident})", _tabular_json_value)
+                add_aggregate(index, "sum", f"SUM({ident})", _tabular_json_value)
+                add_aggregate(index, "stddev", f"STDDEV_SAMP({ident})", _tabular_json_value)
+            elif family == "date":
+                add_aggregate(index, "min", f"MIN({ident})", _tabular_json_value)
+                add_aggregate(index, "max", f"MAX({ident})", _tabular_json_value)
+            elif family == "boolean":
+                add_aggregate(
+                    index, "true_count", f"SUM(CASE WHEN {ident} IS TRUE THEN 1 ELSE 0 END)", to_count
                 )
-            row = conn.execute(f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
-            values = list(row or [])
-            for position, index in enumerate(numeric_positions):
-                base = position * 5
-                item = out_columns[index]
-                item["min"] = _tabular_json_value(values[base]) if base < len(values) else None
-                item["max"] = _tabular_json_value(values[base + 1]) if base + 1 < len(values) else None
-                item["mean"] = _tabular_json_value(values[base + 2]) if base + 2 < len(values) else None
-                item["sum"] = _tabular_json_value(values[base + 3]) if base + 3 < len(values) else None
-                item["stddev"] = _tabular_json_value(values[base + 4]) if base + 4 < len(values) else None
-
-        if len(date_positions) > 0:
-            select_items = []
-            for index in date_positions:
-                ident = str(selected_meta[index]["ident"])
-                select_items.extend(
-                    [
-                        f"MIN({ident}) AS min_{index}",
-                        f"MAX({ident}) AS max_{index}",
-                    ]
+                add_aggregate(
+                    index, "false_count", f"SUM(CASE WHEN {ident} IS FALSE THEN 1 ELSE 0 END)", to_count
                 )
-            row = conn.execute(f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
-            values = list(row or [])
-            for position, index in enumerate(date_positions):
-                base = position * 2
-                item = out_columns[index]
-                item["min"] = _tabular_json_value(values[base]) if base < len(values) else None
-                item["max"] = _tabular_json_value(values[base + 1]) if base + 1 < len(values) else None
-
-        if len(boolean_positions) > 0:
-            select_items = []
-            for index in boolean_positions:
-                ident = str(selected_meta[index]["ident"])
-                select_items.extend(
-                    [
-                        f"SUM(CASE WHEN {ident} IS TRUE THEN 1 ELSE 0 END) AS true_count_{index}",
-                        f"SUM(CASE WHEN {ident} IS FALSE THEN 1 ELSE 0 END) AS false_count_{index}",
-                    ]
+            else:
+                text_positions.append(index)
+                add_aggregate(
+                    index, "min_length", f"MIN(LENGTH(CAST({ident} AS VARCHAR)))", _tabular_json_value
                 )
-            row = conn.execute(f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
-            values = list(row or [])
-            for position, index in enumerate(boolean_positions):
-                base = position * 2
-                item = out_columns[index]
-                item["true_count"] = int(values[base] or 0) if base < len(values) else 0
-                item["false_count"] = int(values[base + 1] or 0) if base + 1 < len(values) else 0
-
-        if len(text_positions) > 0:
-            length_select_items: List[str] = []
-            common_select_items: List[str] = []
-            for index in text_positions:
-                col_name = str(selected_meta[index]["name"])
-                ident = str(selected_meta[index]["ident"])
-                col_literal = _tabular_quote_literal(col_name)
-                length_select_items.extend(
-                    [
-                        f"MIN(LENGTH(CAST({ident} AS VARCHAR))) AS min_length_{index}",
-                        f"MAX(LENGTH(CAST({ident} AS VARCHAR))) AS max_length_{index}",
-                    ]
+                add_aggregate(
+                    index, "max_length", f"MAX(LENGTH(CAST({ident} AS VARCHAR)))", _tabular_json_value
                 )
+                # One GROUP BY per column on purpose: each branch scans only its
+                # own column, whereas UNPIVOT or GROUPING SETS over all text
+                # columns in one pass measured 3-4x slower.
                 common_select_items.append(
-                    f"SELECT {col_literal} AS column_name, value, count FROM ("
+                    f"SELECT {_tabular_quote_literal(col_name)} AS column_name, value, count FROM ("
                     f"SELECT CAST({ident} AS VARCHAR) AS value, COUNT(*) AS count "
                     f"FROM {TABULAR_TABLE_NAME} WHERE {ident} IS NOT NULL "
                     "GROUP BY 1 ORDER BY 2 DESC, 1 ASC LIMIT 5)"
                 )
 
-            length_row = conn.execute(f"SELECT {', '.join(length_select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
-            length_values = list(length_row or [])
-            for position, index in enumerate(text_positions):
-                base = position * 2
-                item = out_columns[index]
-                item["min_length"] = _tabular_json_value(length_values[base]) if base < len(length_values) else None
-                item["max_length"] = (
-                    _tabular_json_value(length_values[base + 1]) if base + 1 < len(length_values) else None
+        if len(select_items) > 0:
+            row = conn.execute(f"SELECT {', '.join(select_items)} FROM {TABULAR_TABLE_NAME}").fetchone()
+            values = list(row or [])
+            for position, (index, key, convert) in enumerate(slots):
+                value = values[position] if position < len(values) else None
+                out_columns[index][key] = convert(value)
+        for index in text_positions:
+            out_columns[index]["most_common"] = []
+
+        if len(common_select_items) > 0:
+            common_rows = conn.execute(" UNION ALL ".join(common_select_items)).fetchall()
+            text_index_by_name: Dict[str, int] = {}
+            for index in text_positions:
+                text_index_by_name[str(selected_meta[index]["name"])] = index
+            for row in common_rows:
+                if len(row) < 3:
+                    continue
+                col_name = str(row[0] or "")
+                index = text_index_by_name.get(col_name)
+                if index is None:
+                    continue
+                out_columns[index]["most_common"].append(
+                    {
+                        "value": _tabular_json_value(row[1]),
+                        "count": int(row[2] or 0),
+                    }
                 )
-                item["most_common"] = []
-
-            if len(common_select_items) > 0:
-                common_rows = conn.execute(" UNION ALL ".join(common_select_items)).fetchall()
-                text_index_by_name: Dict[str, int] = {}
-                for index in text_positions:
-                    text_index_by_name[str(selected_meta[index]["name"])] = index
-                for row in common_rows:
-                    if len(row) < 3:
-                        continue
-                    col_name = str(row[0] or "")
-                    index = text_index_by_name.get(col_name)
-                    if index is None:
-                        continue
-                    out_columns[index]["most_common"].append(
-                        {
-                            "value": _tabular_json_value(row[1]),
-                            "count": int(row[2] or 0),
-                        }
-                    )
-                for index in text_positions:
-                    out_columns[index]["most_common"].sort(
-                        key=lambda item: (
-                            -int(item.get("count", 0)),
-                            str(item.get("value") or ""),
-                        )
+            for index in text_positions:
+                out_columns[index]["most_common"].sort(
+                    key=lambda item: (
+                        -int(item.get("count", 0)),
+                        str(item.get("value") or ""),
                     )
+                )
     finally:
-        conn.close()
+        _tabular_release_connection(cache["db_path"], conn)
 
     return {
         "row_count": row_count,
@@ -5693,16 +6318,20 @@ def tabular_read_rows(params: Dict[str, Any]) -> Dict[str, Any]:
     offset = row_start - 1
     select_list = ", ".join(_tabular_quote_ident(str(col["name"])) for col in selected)
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
+    conn = _tabular_acquire_connection(cache["db_path"])
     try:
-        rows = conn.execute(
-            f"SELECT {select_list} FROM {TABULAR_TABLE_NAME} ORDER BY rowid LIMIT ? OFFSET ?",
-            [row_count_requested, offset],
-        ).fetchall()
+        # The cache table is written once by CREATE TABLE AS, so rowid is a
+        # dense 0-based sequence and a range predicate replaces OFFSET.
+        cursor = conn.execute(
+            f"SELECT {select_list} FROM {TABULAR_TABLE_NAME} WHERE rowid >= ? AND rowid < ? ORDER BY rowid",
+            [offset, offset + row_count_requested],
+        )
+        rows = cursor.fetchall()
+        db_types = [desc[1] if len(desc) > 1 else "" for desc in (cursor.description or [])]
     finally:
-        conn.close()
+        _tabular_release_connection(cache["db_path"], conn)
 
-    row_values = [[_tabular_json_value(v) for v in row] for row in rows]
+    row_values = _tabular_json_rows(rows, db_types)
     total_rows = int(metadata.get("row_count", 0))
     return {
         "columns": [str(col.get("name") or "") for col in selected],
@@ -5720,12 +6349,15 @@ def tabular_query(params: Dict[str, Any]) -> Dict[str, Any]:
     query = _tabular_validate_query(params.get("query"))
     window_rows = _tabular_parse_positive_int(params.get("window_rows"), "window_rows", TABULAR_CHUNK_ROWS)
     window_offset = _tabular_parse_non_negative_int(params.get("window_offset"), "window_offset", 0)
+    # COUNT(*) OVER() makes DuckDB finish the whole result for every window;
+    # later pages skip it by default since the caller saw the total on page one.
+    include_total = bool(_coerce_bool_strict(params.get("include_total"), window_offset == 0))
     total_column_ident = _tabular_quote_ident(TABULAR_TOTAL_COUNT_COLUMN)
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
+    conn = _tabular_acquire_connection(cache["db_path"])
     start = time.time()
     try:
-        def _read_window_with_total() -> Tuple[List[List[Any]], List[str], List[str], int]:
+        def _read_window_with_total() -> Tuple[List[List[Any]], List[str], List[str], List[Any], int]:
             cursor = conn.execute(
                 f"SELECT q.*, COUNT(*) OVER() AS {total_column_ident} FROM ({query}) AS q LIMIT ? OFFSET ?",
                 [window_rows, window_offset],
@@ -5733,14 +6365,12 @@ def tabular_query(params: Dict[str, Any]) -> Dict[str, Any]:
             rows_local = cursor.fetchall()
             description = list(cursor.description or [])
             if len(description) == 0:
-                return [], [], [], 0
+                return [], [], [], [], 0
 
             data_description = description[:-1]
             columns_local = [str(desc[0]) for desc in data_description]
-            column_types_local = [
-                _tabular_inferred_type(desc[1] if len(desc) > 1 else "")
-                for desc in data_description
-            ]
+            db_types_local = [desc[1] if len(desc) > 1 else "" for desc in data_description]
+            column_types_local = [_tabular_inferred_type(db_type) for db_type in db_types_local]
 
             total_local = 0
             trimmed_rows: List[List[Any]] = []
@@ -5751,38 +6381,54 @@ def tabular_query(params: Dict[str, Any]) -> Dict[str, Any]:
                     continue
                 total_local = int(values[-1] or 0)
                 trimmed_rows.append(values[:-1])
-            return trimmed_rows, columns_local, column_types_local, total_local
+            return trimmed_rows, columns_local, column_types_local, db_types_local, total_local
+
+        def _read_window_without_total() -> Tuple[List[List[Any]], List[str], List[str], List[Any], int]:
+            # One extra row tells whether another window follows.
+            cursor = conn.execute(
+                f"SELECT q.* FROM ({query}) AS q LIMIT ? OFFSET ?",
+                [window_rows + 1, window_offset],
+            )
+            rows_local = cursor.fetchall()
+            description = list(cursor.description or [])
+            columns_local = [str(desc[0]) for desc in description]
+            db_types_local = [desc[1] if len(desc) > 1 else "" for desc in description]
+            column_types_local = [_tabular_inferred_type(db_type) for db_type in db_types_local]
+            return rows_local, columns_local, column_types_local, db_types_local, 0
 
-        rows, columns, column_types, total_row_count = _tabular_run_with_timeout(
+        rows, columns, column_types, db_types, total_row_count = _tabular_run_with_timeout(
             conn,
-            _read_window_with_total,
+            _read_window_with_total if include_total else _read_window_without_total,
             error_code="FILE_READ_FAILED",
         )
-
-        if len(rows) == 0 and window_offset > 0:
-            def _count_rows() -> int:
-                row = conn.execute(f"SELECT COUNT(*) AS total_row_count FROM ({query}) AS q").fetchone()
-                return int(row[0] or 0) if row else 0
-
-            total_row_count = _tabular_run_with_timeout(conn, _count_rows, error_code="FILE_READ_FAILED")
     except WorkerError:
         raise
     except Exception as err:
         raise WorkerError("FILE_READ_FAILED", f"query failed: {err}")
     finally:
-        conn.close()
+        _tabular_release_connection(cache["db_path"], conn)
 
-    row_values = [[_tabular_json_value(v) for v in row] for row in rows]
+    if include_total:
+        # A window past the end carries no COUNT(*) OVER() value; rather than
+        # re-running the whole query just to count it, report the total as unknown.
+        total_known = len(rows) > 0 or window_offset == 0
+        has_more = total_known and (window_offset + len(rows)) < total_row_count
+    else:
+        total_known = False
+        has_more = len(rows) > window_rows
+        rows = rows[:window_rows]
+    row_values = _tabular_json_rows(rows, db_types)
     elapsed_ms = int((time.time() - start) * 1000)
     return {
         "columns": columns,
         "column_types": column_types,
         "rows": row_values,
         "row_count": len(row_values),
-        "total_row_count": total_row_count,
+        "total_row_count": total_row_count if total_known else None,
+        "total_known": total_known,
         "window_rows": window_rows,
         "window_offset": window_offset,
-        "has_more": (window_offset + len(row_values)) < total_row_count,
+        "has_more": has_more,
         "query_elapsed_ms": elapsed_ms,
     }
 
@@ -5793,10 +6439,19 @@ def _tabular_csv_cell_value(value: Any) -> Any:
     if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
         return value.isoformat()
     if isinstance(value, bytes):
-        return base64.b64encode(value).decode("ascii")
+        return _tabular_json_bytes(value)
     return value
 
 
+def _tabular_csv_passthrough_type(db_type: Any) -> bool:
+    name = str(db_type or "").upper()
+    return (
+        name in _TABULAR_JSON_PASSTHROUGH_TYPES
+        or name in ("FLOAT", "DOUBLE")
+        or name.startswith("DECIMAL")
+    )
+
+
 def _tabular_normalize_sheet_name(value: Any) -> str:
     raw = str(value or "").strip() or "Sheet1"
     sanitized = raw.replace("\\", "_").replace("/", "_").replace("?", "_").replace("*", "_")
@@ -5804,22 +6459,58 @@ def _tabular_normalize_sheet_name(value: Any) -> str:
     return sanitized[:31] or "Sheet1"
 
 
+# DuckDB renders these types exactly like Python's isoformat(), so the export
+# query formats them in bulk instead of converting each cell in Python.
+_TABULAR_CSV_SQL_FORMATS = {
+    "DATE": "CAST({ref} AS VARCHAR)",
+    "TIMESTAMP": (
+        "CASE WHEN strftime({ref}, '%f') = '000000' THEN strftime({ref}, '%Y-%m-%dT%H:%M:%S') "
+        "ELSE strftime({ref}, '%Y-%m-%dT%H:%M:%S.%f') END"
+    ),
+}
+
+
 def _tabular_export_csv(conn: Any, query: str, target_path: str) -> Tuple[int, int]:
     def _export() -> Tuple[int, int]:
-        cursor = conn.execute(query)
-        columns = [str(desc[0]) for desc in cursor.description]
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        # conn.sql() only binds the query, which is enough to learn its column
+        # names (duplicates included) and types without running it.
+        relation = conn.sql(query)
+        columns = [str(name) for name in relation.columns]
+        sql_formats = [_TABULAR_CSV_SQL_FORMATS.get(str(db_type).upper()) for db_type in relation.types]
+        if any(sql_formats):
+            select_items = [
+                fmt.format(ref=f"#{position}") if fmt else f"#{position}"
+                for position, fmt in enumerate(sql_formats, start=1)
+            ]
+            cursor = conn.execute(f"SELECT {', '.join(select_items)} FROM ({query}) AS q")
+        else:
+            cursor = conn.execute(query)
+        # csv.writer already renders None as "" and numbers/strings as-is, so
+        # only temporal, blob and other non-scalar columns need converting.
+        convert_positions = [
+            index for index, desc in enumerate(cursor.description)
+            if not _tabular_csv_passthrough_type(desc[1] if len(desc) > 1 else "")
+        ]
         row_count = 0
-        with open(target_path, "w", encoding="utf-8", newline="") as handle:
+
+        def _rows() -> Iterator[Any]:
+            nonlocal row_count
+            for batch in iter(lambda: cursor.fetchmany(TABULAR_EXPORT_FETCH_ROWS), []):
+                row_count += len(batch)
+                if not convert_positions:
+                    yield from batch
+                    continue
+                for row in batch:
+                    values = list(row)
+                    for index in convert_positions:
+                        values[index] = _tabular_csv_cell_value(values[index])
+                    yield values
+
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with open(target_path, "w", encoding="utf-8", newline="", buffering=1 << 20) as handle:
             writer = csv.writer(handle)
             writer.writerow(columns)
-            while True:
-                batch = cursor.fetchmany(1000)
-                if not batch:
-                    break
-                for row in batch:
-                    writer.writerow([_tabular_csv_cell_value(value) for value in row])
-                    row_count += 1
+            writer.writerows(_rows())
         return row_count, len(columns)
 
     return _tabular_run_with_timeout(conn, _export, error_code="FILE_WRITE_FAILED")
@@ -5830,21 +6521,16 @@ def _tabular_export_xlsx(conn: Any, query: str, target_path: str, sheet_name: st
     def _export() -> Tuple[int, int]:
         cursor = conn.execute(query)
         columns = [str(desc[0]) for desc in cursor.description]
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = _tabular_normalize_sheet_name(sheet_name)
-        ws.append([_xlsx_sanitize_value(c) for c in columns])
-        row_count = 0
-        while True:
-            batch = cursor.fetchmany(1000)
-            if not batch:
-                break
-            for row in batch:
-                ws.append([_xlsx_sanitize_value(_tabular_json_value(value)) for value in row])
-                row_count += 1
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-        wb.save(target_path)
-        return row_count, len(columns)
+        # Write-only mode streams rows into the archive instead of keeping a
+        # Cell object per value alive until save.
+        wb = openpyxl.Workbook(write_only=True)
+        try:
+            ws = wb.create_sheet(title=_tabular_normalize_sheet_name(sheet_name))
+            written_rows = _xlsx_append_tabular_block(ws, columns, _tabular_iter_export_rows(cursor), True)
+            _xlsx_save_workbook_atomic(wb, target_path)
+        finally:
+            _xlsx_close_write_only(wb)
+        return written_rows - 1, len(columns)
 
     return _tabular_run_with_timeout(conn, _export, error_code="FILE_WRITE_FAILED")
 
@@ -5861,20 +6547,18 @@ def _tabular_export_query_and_warnings(params: Dict[str, Any]) -> Tuple[str, Lis
     return export_query, warnings
 
 
-def _tabular_query_rows_for_export(conn: Any, query: str) -> Tuple[List[str], List[List[Any]]]:
-    def _read_rows() -> Tuple[List[str], List[List[Any]]]:
-        cursor = conn.execute(query)
-        columns = [str(desc[0]) for desc in (cursor.description or [])]
-        rows: List[List[Any]] = []
-        while True:
-            batch = cursor.fetchmany(1000)
-            if not batch:
-                break
-            for row in batch:
-                rows.append([_tabular_json_value(value) for value in row])
-        return columns, rows
-
-    return _tabular_run_with_timeout(conn, _read_rows, error_code="FILE_READ_FAILED")
+def _tabular_iter_export_rows(cursor: Any) -> Iterator[Sequence[Any]]:
+    # Column types are fixed for the whole result, so decide once which
+    # columns need _tabular_json_value instead of converting every cell.
+    db_types = [desc[1] for desc in (cursor.description or [])]
+    convert_positions = _tabular_json_convert_positions(db_types)
+    for batch in iter(lambda: cursor.fetchmany(TABULAR_EXPORT_FETCH_ROWS), []):
+        if convert_positions:
+            yield from _tabular_json_rows(batch, db_types, convert_positions)
+        else:
+            # The sheet writers only iterate each row, so DuckDB's tuples
+            # can go through without a list copy.
+            yield from batch
 
 
 def _xlsx_parse_anchor_cell(
@@ -5912,10 +6596,18 @@ def _xlsx_written_range(
 
 
 def _xlsx_sheet_has_data(ws: Any) -> bool:
+    # iter_rows over max_row x max_column creates a Cell for every empty slot
+    # of the rectangle; the sparse cell store only holds cells that exist.
+    cells = getattr(ws, "_cells", None)
+    if isinstance(cells, dict):
+        return any(cell.value is not None for cell in cells.values())
     max_row = int(getattr(ws, "max_row", 0) or 0)
     max_col = int(getattr(ws, "max_column", 0) or 0)
     if max_row <= 0 or max_col <= 0:
         return False
+    # The row-major scan already stops at the first populated row; a corner
+    # probe or values_only does not help, since both still go through
+    # ws.cell() for every slot they visit.
     for row in ws.iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_col):
         for cell in row:
             if cell.value is not None:
@@ -5933,6 +6625,13 @@ def _xlsx_clear_sheet_contents(ws: Any) -> None:
             ws.unmerge_cells(str(merged))
         except Exception:
             continue
+    # Deleting every row and column leaves an empty cell store but shifts the
+    # remaining cells once per delete; clearing the store directly is the same
+    # end state and keeps the sheet's own settings either way.
+    cells = getattr(ws, "_cells", None)
+    if isinstance(cells, dict):
+        cells.clear()
+        return
     max_row = int(getattr(ws, "max_row", 0) or 0)
     max_col = int(getattr(ws, "max_column", 0) or 0)
     if max_row > 0:
@@ -5941,58 +6640,131 @@ def _xlsx_clear_sheet_contents(ws: Any) -> None:
         ws.delete_cols(1, max_col)
 
 
-def _xlsx_clear_rectangle(
-    ws: Any,
-    start_row: int,
-    start_col: int,
-    row_count: int,
-    column_count: int,
-) -> None:
-    if row_count <= 0 or column_count <= 0:
-        return
-    end_row = start_row + row_count - 1
-    end_col = start_col + column_count - 1
-    for row in ws.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col, max_col=end_col):
-        for cell in row:
-            cell.value = None
-
-
 def _xlsx_write_tabular_block(
     ws: Any,
     start_row: int,
     start_col: int,
     columns: List[str],
-    rows: List[List[Any]],
+    rows: Iterable[Sequence[Any]],
     include_header: bool,
+    overwrite_empty: bool = False,
 ) -> int:
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    # Hot loop: bind the cell accessor and the sanitizer once. ws.cell()
+    # ignores value=None, which leaves whatever was there before;
+    # overwrite_empty assigns every cell so the block also clears its own range.
+    cell = ws.cell
+    strip_illegal = ILLEGAL_CHARACTERS_RE.sub
+    # A None only matters where a cell already exists, so with the sparse
+    # cell store at hand, empty slots are left alone instead of getting a
+    # fresh Cell that would never be saved.
+    existing_cells = getattr(ws, "_cells", None)
+    if not isinstance(existing_cells, dict):
+        existing_cells = None
+
+    def _write_row(row_index: int, values: Iterable[Any]) -> None:
+        for col_index, value in enumerate(values, start_col):
+            if value is None and existing_cells is not None:
+                if overwrite_empty:
+                    existing = existing_cells.get((row_index, col_index))
+                    if existing is not None:
+                        existing.value = None
+                continue
+            if isinstance(value, str):
+                value = strip_illegal("", value)
+            if overwrite_empty:
+                cell(row_index, col_index).value = value
+            else:
+                cell(row_index, col_index, value)
+
     current_row = start_row
     written_rows = 0
     if include_header:
-        for index, column_name in enumerate(columns):
-            ws.cell(row=current_row, column=start_col + index, value=_xlsx_sanitize_value(column_name))
+        _write_row(current_row, columns)
         current_row += 1
         written_rows += 1
     for values in rows:
-        for index, value in enumerate(values):
-            ws.cell(row=current_row, column=start_col + index, value=_xlsx_sanitize_value(value))
+        _write_row(current_row, values)
         current_row += 1
         written_rows += 1
+    if existing_cells is not None and written_rows > 0 and columns:
+        # Skipped NULLs leave no Cell behind; anchoring both corners keeps the
+        # sheet extent (saved dimension, max_row for later appends) equal to
+        # the range the block reports as written.
+        cell(start_row, start_col)
+        cell(current_row - 1, start_col + len(columns) - 1)
+    return written_rows
+
+
+def _xlsx_append_tabular_block(ws: Any, columns: List[str], rows: Iterable[Sequence[Any]], include_header: bool) -> int:
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    strip_illegal = ILLEGAL_CHARACTERS_RE.sub
+    written_rows = 0
+    try:
+        if include_header:
+            ws.append([strip_illegal("", name) for name in columns])
+            written_rows += 1
+        for values in rows:
+            ws.append([strip_illegal("", value) if isinstance(value, str) else value for value in values])
+            written_rows += 1
+    except ValueError as err:
+        # The write-only row generator re-raises a failed cell conversion as a
+        # bare ValueError chained to the original one.
+        if not str(err) and isinstance(err.__context__, ValueError):
+            raise err.__context__ from None
+        raise
     return written_rows
 
 
-def _xlsx_save_workbook_atomic(wb: Any, target_path: str) -> None:
+def _xlsx_close_write_only(wb: Any) -> None:
+    """Close unsaved write-only sheets and remove their temp files."""
+    for ws in wb.worksheets:
+        writer = getattr(ws, "_writer", None)
+        if writer is None or getattr(ws, "closed", True):
+            continue
+        for stream in (getattr(ws, "_rows", None), writer):
+            if stream is None:
+                continue
+            try:
+                stream.close()
+            except Exception:
+                pass
+        try:
+            writer.cleanup()
+        except Exception:
+            pass
+    wb.close()
+
+
+def _xlsx_save_workbook_atomic(wb: Any, target_path: str, expected_prev_sha256: Optional[str] = None) -> str:
+    """Save via an exclusive temp file, fsync and rename; return the new sha256."""
     target_dir = os.path.dirname(target_path) or "."
     os.makedirs(target_dir, exist_ok=True)
     fd, tmp_path = tempfile.mkstemp(prefix=".keenbench-xlsx-", suffix=".tmp.xlsx", dir=target_dir)
-    os.close(fd)
     try:
-        wb.save(tmp_path)
+        with os.fdopen(fd, "wb") as handle:
+            wb.save(handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        # Read back while the bytes are still in the page cache, so callers
+        # get the digest without hashing the target again.
+        new_sha256 = _file_sha256(tmp_path)
+        # An empty expected_prev_sha256 means the target must not exist yet.
+        if expected_prev_sha256 is not None:
+            current_sha256 = _file_sha256(target_path) if os.path.isfile(target_path) else ""
+            if current_sha256 != expected_prev_sha256:
+                raise WorkerError("VALIDATION_FAILED", "target workbook changed since expected_prev_sha256 was taken")
         os.replace(tmp_path, target_path)
+        return new_sha256
     except Exception as err:
         try:
             os.remove(tmp_path)
         except Exception:
             pass
+        if isinstance(err, WorkerError):
+            raise
         raise WorkerError("FILE_WRITE_FAILED", f"failed to write xlsx: {err}")
 
 
@@ -6011,7 +6783,7 @@ def tabular_export(params: Dict[str, Any]) -> Dict[str, Any]:
     export_query, warnings = _tabular_export_query_and_warnings(params)
     sheet_name = _tabular_normalize_sheet_name(params.get("sheet"))
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
+    conn = _tabular_acquire_connection(cache["db_path"])
     try:
         if format_name == "csv":
             row_count, column_count = _tabular_export_csv(conn, export_query, target_path)
@@ -6022,7 +6794,7 @@ def tabular_export(params: Dict[str, Any]) -> Dict[str, Any]:
     except Exception as err:
         raise WorkerError("FILE_WRITE_FAILED", f"export failed: {err}")
     finally:
-        conn.close()
+        _tabular_release_connection(cache["db_path"], conn)
 
     if format_name == "csv" and target_root == "draft":
         _tabular_invalidate_cache_for_rel_path(workbench_id, target_path_rel)
@@ -6066,52 +6838,53 @@ def tabular_update_from_export(params: Dict[str, Any]) -> Dict[str, Any]:
     clear_target_range = _coerce_bool_strict(params.get("clear_target_range"), False)
     if clear_target_range and mode != "write_range":
         raise WorkerError("VALIDATION_FAILED", "clear_target_range is only supported for write_range mode")
+    expected_prev_sha256 = params.get("expected_prev_sha256")
+    if expected_prev_sha256 is not None:
+        expected_prev_sha256 = str(expected_prev_sha256).strip().lower()
 
     export_query, warnings = _tabular_export_query_and_warnings(params)
 
-    conn = _tabular_open_connection(cache["db_path"], read_only=True)
-    try:
-        columns, rows = _tabular_query_rows_for_export(conn, export_query)
-    except WorkerError:
-        raise
-    except Exception as err:
-        raise WorkerError("FILE_READ_FAILED", f"query failed: {err}")
-    finally:
-        conn.close()
-
     workbook_exists = os.path.isfile(target_path)
-    if workbook_exists:
-        try:
-            wb = openpyxl.load_workbook(target_path)
-        except WorkerError:
-            raise
-        except Exception as err:
-            raise WorkerError("FILE_READ_FAILED", f"failed to read xlsx: {err}")
+    if not workbook_exists and not create_workbook_if_missing:
+        raise WorkerError("VALIDATION_FAILED", "target workbook not found")
+    # A new workbook holding only the replaced sheet has nothing to carry
+    # over, so stream it through a write-only workbook.
+    fresh_workbook = mode == "replace_sheet" and not workbook_exists and create_sheet_if_missing
+    if fresh_workbook:
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet(title=sheet_name)
     else:
-        if not create_workbook_if_missing:
-            raise WorkerError("VALIDATION_FAILED", "target workbook not found")
-        wb = openpyxl.Workbook()
+        if workbook_exists:
+            try:
+                wb = openpyxl.load_workbook(target_path)
+            except WorkerError:
+                raise
+            except Exception as err:
+                raise WorkerError("FILE_READ_FAILED", f"failed to read xlsx: {err}")
+        else:
+            wb = openpyxl.Workbook()
 
-    ws = wb[sheet_name] if sheet_name in wb.sheetnames else None
-    if ws is None:
-        if not create_sheet_if_missing:
-            raise WorkerError("VALIDATION_FAILED", f"sheet not found: {sheet_name}")
-        if len(wb.sheetnames) == 1:
-            default_ws = wb[wb.sheetnames[0]]
-            if not _xlsx_sheet_has_data(default_ws):
-                try:
-                    default_ws.title = sheet_name
-                    ws = default_ws
-                except Exception:
-                    ws = None
+        ws = wb[sheet_name] if sheet_name in wb.sheetnames else None
         if ws is None:
-            ws = wb.create_sheet(sheet_name)
+            if not create_sheet_if_missing:
+                raise WorkerError("VALIDATION_FAILED", f"sheet not found: {sheet_name}")
+            if len(wb.sheetnames) == 1:
+                default_ws = wb[wb.sheetnames[0]]
+                if not _xlsx_sheet_has_data(default_ws):
+                    try:
+                        default_ws.title = sheet_name
+                        ws = default_ws
+                    except Exception:
+                        ws = None
+            if ws is None:
+                ws = wb.create_sheet(sheet_name)
 
     write_start_row = 1
     write_start_col = 1
     include_header_for_write = include_header
     if mode == "replace_sheet":
-        _xlsx_clear_sheet_contents(ws)
+        if not fresh_workbook:
+            _xlsx_clear_sheet_contents(ws)
     elif mode == "append_rows":
         sheet_has_data = _xlsx_sheet_has_data(ws)
         write_start_row = int(getattr(ws, "max_row", 0) or 0) + 1 if sheet_has_data else 1
@@ -6125,19 +6898,46 @@ def tabular_update_from_export(params: Dict[str, Any]) -> Dict[str, Any]:
             column_index_from_string,
             get_column_letter,
         )
-        if clear_target_range:
-            total_write_rows = len(rows) + (1 if include_header_for_write else 0)
-            _xlsx_clear_rectangle(ws, write_start_row, write_start_col, total_write_rows, len(columns))
+
+    def _export_rows() -> Tuple[List[str], int]:
+        # Rows stream from the cursor into the sheet and DuckDB does most of
+        # the work inside fetchmany, so the timeout covers the write as well.
+        try:
+            cursor = conn.execute(export_query)
+        except Exception as err:
+            raise WorkerError("FILE_READ_FAILED", f"query failed: {err}")
+        columns = [str(desc[0]) for desc in (cursor.description or [])]
+        try:
+            if fresh_workbook:
+                written_rows = _xlsx_append_tabular_block(
+                    ws,
+                    columns,
+                    _tabular_iter_export_rows(cursor),
+                    include_header_for_write,
+                )
+            else:
+                written_rows = _xlsx_write_tabular_block(
+                    ws,
+                    write_start_row,
+                    write_start_col,
+                    columns,
+                    _tabular_iter_export_rows(cursor),
+                    include_header_for_write,
+                    overwrite_empty=clear_target_range,
+                )
+        except WorkerError:
+            raise
+        except Exception as err:
+            raise WorkerError("FILE_WRITE_FAILED", f"failed to write xlsx: {err}")
+        return columns, written_rows
 
     try:
-        written_rows = _xlsx_write_tabular_block(
-            ws,
-            write_start_row,
-            write_start_col,
-            columns,
-            rows,
-            include_header_for_write,
-        )
+        conn = _tabular_acquire_connection(cache["db_path"])
+        try:
+            columns, written_rows = _tabular_run_with_timeout(conn, _export_rows, error_code="FILE_READ_FAILED")
+        finally:
+            _tabular_release_connection(cache["db_path"], conn)
+
         written_range = _xlsx_written_range(
             write_start_row,
             write_start_col,
@@ -6145,19 +6945,25 @@ def tabular_update_from_export(params: Dict[str, Any]) -> Dict[str, Any]:
             len(columns),
             get_column_letter,
         )
-        _xlsx_save_workbook_atomic(wb, target_path)
-    except WorkerError:
-        raise
-    except Exception as err:
-        raise WorkerError("FILE_WRITE_FAILED", f"failed to write xlsx: {err}")
+        try:
+            sha256 = _xlsx_save_workbook_atomic(wb, target_path, expected_prev_sha256)
+        except WorkerError:
+            raise
+        except Exception as err:
+            raise WorkerError("FILE_WRITE_FAILED", f"failed to write xlsx: {err}")
+    finally:
+        if fresh_workbook:
+            _xlsx_close_write_only(wb)
 
+    data_rows = written_rows - (1 if include_header_for_write else 0)
     return {
         "target_path": target_path_rel,
         "sheet": sheet_name,
         "mode": mode,
-        "row_count": len(rows),
+        "row_count": data_rows,
         "column_count": len(columns),
         "written_range": written_range,
+        "sha256": sha256,
         "warnings": warnings,
     }
 
@@ -6217,39 +7023,43 @@ METHODS = {
 }
 
 
+_REQUEST_CONTEXT_KEYS = frozenset({
+    "workbench_id",
+    "root",
+    "path",
+    "page_index",
+    "scale",
+    "slide_index",
+    "sheet",
+    "row_start",
+    "row_count",
+    "col_start",
+    "col_count",
+    "range",
+    "section",
+    "section_index",
+    "pages",
+    "line_start",
+    "line_count",
+    "query",
+    "window_rows",
+    "window_offset",
+    "columns",
+    "format",
+    "source_path",
+    "target_path",
+    "source_root",
+    "target_root",
+    "detail",
+})
+
+
 def _extract_context(params: Dict[str, Any]) -> Dict[str, Any]:
-    ctx: Dict[str, Any] = {}
-    for key in [
-        "workbench_id",
-        "root",
-        "path",
-        "page_index",
-        "scale",
-        "slide_index",
-        "sheet",
-        "row_start",
-        "row_count",
-        "col_start",
-        "col_count",
-        "range",
-        "section",
-        "section_index",
-        "pages",
-        "line_start",
-        "line_count",
-        "query",
-        "window_rows",
-        "window_offset",
-        "columns",
-        "format",
-        "source_path",
-        "target_path",
-        "source_root",
-        "target_root",
-        "detail",
-    ]:
-        if key in params:
-            ctx[key] = params.get(key)
+    # Requests carry a handful of params, so walk those rather than probing
+    # every context key.
+    ctx: Dict[str, Any] = {
+        key: value for key, value in params.items() if key in _REQUEST_CONTEXT_KEYS
+    }
     assets = params.get("assets")
     if isinstance(assets, list):
         ctx["assets_count"] = len(assets)
@@ -6267,9 +7077,19 @@ def _extract_context(params: Dict[str, Any]) -> Dict[str, Any]:
     return ctx
 
 
+def _parse_request(line: str) -> Any:
+    if _ORJSON is not None:
+        try:
+            return _ORJSON.loads(line)
+        except _ORJSON.JSONDecodeError:
+            # NaN, lone surrogates and integers past 64 bits; the stdlib parser copes.
+            pass
+    return json.loads(line)
+
+
 def handle_request(line: str) -> None:
     try:
-        req = json.loads(line)
+        req = _parse_request(line)
     except Exception as err:
         log_debug("request.invalid_json", error=str(err), size_bytes=len(line))
         return
@@ -6283,15 +7103,17 @@ def handle_request(line: str) -> None:
         )
         return
     method = req.get("method")
-    if method not in METHODS:
+    entry = METHODS.get(method)
+    if entry is None:
         log_error("request.unknown_method", id=req_id, method=method)
         send_error(req_id, "VALIDATION_FAILED", f"unknown method: {method}")
         return
     params = req.get("params") or {}
-    func, mode = METHODS[method]
+    func, mode = entry
     ctx = _extract_context(params)
     start = time.time()
-    log_debug("request.start", id=req_id, method=method, mode=mode, **ctx)
+    if DEBUG_ENABLED:
+        log_debug("request.start", id=req_id, method=method, mode=mode, **ctx)
     try:
         if mode == "write":
             root = (params.get("root") or "draft").strip()
@@ -6329,8 +7151,27 @@ def handle_request(line: str) -> None:
         send_error(req_id, code, str(err))
 
 
+def _warmup_imports() -> None:
+    """Pre-import python-pptx and lxml so the first PPTX request skips module load."""
+    start = time.time()
+    try:
+        import lxml.etree  # noqa: F401
+        import pptx  # noqa: F401
+        import pptx.enum.shapes  # noqa: F401
+        import pptx.enum.text  # noqa: F401
+        import pptx.util  # noqa: F401
+    except Exception as err:
+        log_debug("worker.warmup_failed", error=str(err))
+        return
+    log_debug("worker.warmup_done", duration_ms=int((time.time() - start) * 1000))
+
+
 def main() -> None:
     init_config()
+    # Imports hold the module lock, so a request racing the warm-up just waits on it.
+    warmup = threading.Thread(target=_warmup_imports, name="pyworker-warmup")
+    warmup.daemon = True
+    warmup.start()
     for line in sys.stdin:
         if not line.strip():
             continue
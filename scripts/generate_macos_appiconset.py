@@ -1,11 +1,27 @@
 #!/usr/bin/env python3
 import argparse
+import os
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
+def _resize(size: int, base_png: Path, out_dir: Path) -> Path:
+    out_path = out_dir / f"app_icon_{size}.png"
+    if size == 1024:
+        shutil.copyfile(base_png, out_path)
+    else:
+        subprocess.run(
+            ["sips", "-z", str(size), str(size), str(base_png), "--out", str(out_path)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    return out_path
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate macOS AppIcon.appiconset PNGs from an SVG.")
     parser.add_argument(
@@ -46,17 +62,10 @@ def main() -> int:
             raise SystemExit("qlmanage did not produce a PNG thumbnail.")
         base_png = pngs[0]
 
-        for size in sizes:
-            out_path = out_dir / f"app_icon_{size}.png"
-            if size == 1024:
-                shutil.copyfile(base_png, out_path)
-            else:
-                subprocess.run(
-                    ["sips", "-z", str(size), str(size), str(base_png), "--out", str(out_path)],
-                    check=True,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
+        # Each size is an independent sips process, so run them side by side.
+        with ThreadPoolExecutor(max_workers=min(len(sizes), os.cpu_count() or 4)) as executor:
+            out_paths = list(executor.map(lambda size: _resize(size, base_png, out_dir), sizes))
+        for size, out_path in zip(sizes, out_paths):
             print(f"Wrote {out_path} ({size}x{size})")
 
     return 0
@@ -0,0 +1,85 @@
+"""Helpers shared by the fixture generator scripts.
+
+PDF fixtures are built as DOCX: generators stage a DOCX beside the target
+PDF and hand the resulting (docx, pdf) pair back to main(), which converts
+every staged file with a single LibreOffice run.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from importlib import resources
+
+from docx import Document
+
+LIBREOFFICE = "/snap/bin/libreoffice"
+
+# Document() re-reads python-docx's bundled template from disk on every call.
+_DEFAULT_DOCX = resources.files("docx").joinpath("templates", "default.docx").read_bytes()
+
+
+def new_document():
+    """Return a blank Document built from the in-memory default template."""
+    return Document(io.BytesIO(_DEFAULT_DOCX))
+
+
+def run_in_processes(jobs):
+    """Run zero-argument jobs in a process pool, yielding results in job order."""
+    # Every job writes its own files, so they can run side by side; processes
+    # rather than threads because the lxml-backed writers are not thread-safe.
+    sys.stdout.flush()  # forked workers would otherwise repeat buffered output
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(job) for job in jobs]
+        for future in futures:
+            yield future.result()
+
+
+def stage_docx(doc, pdf_dst: str) -> tuple[str, str]:
+    """Save doc as a temp DOCX next to pdf_dst and return the pending pair."""
+    # Stage beside the output (snap LibreOffice can't access /tmp)
+    outdir, name = os.path.split(pdf_dst)
+    tmp_docx = os.path.join(outdir, f"_{os.path.splitext(name)[0]}_tmp.docx")
+    doc.save(tmp_docx)
+    return tmp_docx, pdf_dst
+
+
+def convert_staged(jobs: list[tuple[str, str]], outdir: str) -> list[str]:
+    """Convert staged pairs with one LibreOffice run; return the created PDFs."""
+    if not jobs:
+        return []
+    result = subprocess.run(
+        [
+            LIBREOFFICE,
+            "--headless",
+            "--convert-to",
+            "pdf",
+            "--outdir",
+            outdir,
+            *(tmp_docx for tmp_docx, _ in jobs),
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60 * len(jobs),
+    )
+    created = []
+    for tmp_docx, pdf_dst in jobs:
+        # LibreOffice exits 0 even on failure; check for actual PDF
+        tmp_pdf = os.path.join(outdir, os.path.splitext(os.path.basename(tmp_docx))[0] + ".pdf")
+        if not os.path.exists(tmp_pdf):
+            print("ERROR: LibreOffice conversion failed.")
+            print(result.stderr.strip() or result.stdout.strip())
+            raise RuntimeError(f"LibreOffice did not produce {tmp_pdf}")
+        os.replace(tmp_pdf, pdf_dst)
+        created.append(pdf_dst)
+    return created
+
+
+def remove_staged(jobs: list[tuple[str, str]]) -> None:
+    """Delete the temp DOCX files of staged pairs."""
+    for tmp_docx, _ in jobs:
+        if os.path.exists(tmp_docx):
+            os.remove(tmp_docx)
@@ -11,10 +11,8 @@ Usage:
 
 import os
 import shutil
-import subprocess
 import sys
 
-from docx import Document
 from docx.shared import Inches, Pt
 from openpyxl import Workbook
 from pptx import Presentation
@@ -23,6 +21,8 @@ from odf.opendocument import OpenDocumentText
 from odf.text import H, P
 from PIL import Image, ImageDraw, ImageFont
 
+from fixture_common import convert_staged, new_document, remove_staged, run_in_processes, stage_docx
+
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 OFFICE_DIR = os.path.join(ROOT, "engine", "testdata", "office")
 SYNTHETIC_DIR = os.path.join(ROOT, "engine", "testdata", "synthetic")
@@ -33,7 +33,7 @@ SUPPORT_OFFICE_DIR = os.path.join(
 
 def generate_simple_docx():
     """Create simple.docx with headings and paragraphs."""
-    doc = Document()
+    doc = new_document()
     doc.add_heading("Introduction", level=1)
     doc.add_paragraph(
         "This quarterly review covers the key achievements and challenges "
@@ -55,7 +55,7 @@ def generate_simple_docx():
     )
     path = os.path.join(OFFICE_DIR, "simple.docx")
     doc.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def generate_multi_sheet_xlsx():
@@ -102,7 +102,7 @@ def generate_multi_sheet_xlsx():
 
     path = os.path.join(OFFICE_DIR, "multi-sheet.xlsx")
     wb.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def generate_slides_pptx():
@@ -146,12 +146,12 @@ def generate_slides_pptx():
 
     path = os.path.join(OFFICE_DIR, "slides.pptx")
     prs.save(path)
-    print(f"  Created {path}")
+    return path
 
 
-def generate_report_pdf():
-    """Create report.pdf via DOCX → LibreOffice conversion."""
-    doc = Document()
+def stage_report_docx():
+    """Stage the DOCX source for report.pdf; main() converts it."""
+    doc = new_document()
     doc.add_heading("Annual Report", level=1)
     doc.add_paragraph(
         "This annual report provides a comprehensive overview of the "
@@ -194,36 +194,7 @@ def generate_report_pdf():
         "certification for information security management."
     )
 
-    # Use OFFICE_DIR for temp docx (snap LibreOffice can't access /tmp)
-    docx_path = os.path.join(OFFICE_DIR, "_report_tmp.docx")
-    pdf_dst = os.path.join(OFFICE_DIR, "report.pdf")
-    try:
-        doc.save(docx_path)
-        result = subprocess.run(
-            [
-                "/snap/bin/libreoffice",
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                OFFICE_DIR,
-                docx_path,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        # LibreOffice exits 0 even on failure; check for actual PDF
-        tmp_pdf = os.path.join(OFFICE_DIR, "_report_tmp.pdf")
-        if os.path.exists(tmp_pdf):
-            os.replace(tmp_pdf, pdf_dst)
-            print(f"  Created {pdf_dst}")
-        else:
-            print(f"  ERROR: LibreOffice conversion failed: {result.stderr}")
-            sys.exit(1)
-    finally:
-        if os.path.exists(docx_path):
-            os.remove(docx_path)
+    return stage_docx(doc, os.path.join(OFFICE_DIR, "report.pdf"))
 
 
 def generate_notes_odt():
@@ -257,7 +228,7 @@ def generate_notes_odt():
 
     path = os.path.join(OFFICE_DIR, "notes.odt")
     doc.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def generate_chart_png():
@@ -333,7 +304,7 @@ def generate_chart_png():
 
     path = os.path.join(OFFICE_DIR, "chart.png")
     img.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def generate_projects_csv():
@@ -343,7 +314,7 @@ def generate_projects_csv():
         f.write("Project,Start Date,Status\n")
         f.write("Atlas,2026-01-15,Active\n")
         f.write("Beacon,2026-02-01,Planning\n")
-    print(f"  Created {path}")
+    return path
 
 
 def generate_budget_notes_txt():
@@ -354,7 +325,7 @@ def generate_budget_notes_txt():
             "Monthly budget: Entertainment 500 EUR, Groceries 800 EUR, "
             "Transport 200 EUR, Bills 2000 EUR.\n"
         )
-    print(f"  Created {path}")
+    return path
 
 
 def generate_client_data_csv():
@@ -363,12 +334,12 @@ def generate_client_data_csv():
     with open(path, "w") as f:
         f.write("Company,Date,Product,Quantity,Unit Price\n")
         f.write("Acme Corp,2026-03-01,Widget,50,24.99\n")
-    print(f"  Created {path}")
+    return path
 
 
 def generate_invoice_template_docx():
     """Create invoice_template.docx with placeholder fields."""
-    doc = Document()
+    doc = new_document()
     doc.add_heading("Invoice", level=1)
     doc.add_paragraph("Company: {{company}}")
     doc.add_paragraph("Date: {{date}}")
@@ -385,7 +356,7 @@ def generate_invoice_template_docx():
 
     path = os.path.join(SYNTHETIC_DIR, "invoice_template.docx")
     doc.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def generate_quarterly_data_xlsx():
@@ -466,7 +437,7 @@ def generate_quarterly_data_xlsx():
 
     path = os.path.join(SYNTHETIC_DIR, "quarterly_data.xlsx")
     wb.save(path)
-    print(f"  Created {path}")
+    return path
 
 
 def sync_support_office():
@@ -475,28 +446,54 @@ def sync_support_office():
     for name in os.listdir(OFFICE_DIR):
         src = os.path.join(OFFICE_DIR, name)
         dst = os.path.join(SUPPORT_OFFICE_DIR, name)
-        shutil.copy2(src, dst)
+        shutil.copyfile(src, dst)
     print(f"  Synced {OFFICE_DIR} → {SUPPORT_OFFICE_DIR}")
 
 
+GENERATORS = [
+    # Office fixtures
+    generate_simple_docx,
+    generate_multi_sheet_xlsx,
+    generate_slides_pptx,
+    generate_notes_odt,
+    generate_chart_png,
+    # Synthetic data
+    generate_projects_csv,
+    generate_budget_notes_txt,
+    generate_client_data_csv,
+    generate_invoice_template_docx,
+    generate_quarterly_data_xlsx,
+]
+
+# Each returns a (staged docx, pdf destination) pair. All staged files go
+# through one LibreOffice run, whose startup dominates the conversion cost.
+PDF_SOURCES = [
+    stage_report_docx,
+]
+
+
 def main():
     os.makedirs(OFFICE_DIR, exist_ok=True)
     os.makedirs(SYNTHETIC_DIR, exist_ok=True)
 
-    print("Generating office fixtures...")
-    generate_simple_docx()
-    generate_multi_sheet_xlsx()
-    generate_slides_pptx()
-    generate_report_pdf()
-    generate_notes_odt()
-    generate_chart_png()
-
-    print("\nGenerating synthetic data...")
-    generate_projects_csv()
-    generate_budget_notes_txt()
-    generate_client_data_csv()
-    generate_invoice_template_docx()
-    generate_quarterly_data_xlsx()
+    print("Generating office fixtures and synthetic data...")
+    pdf_jobs = []
+    try:
+        results = run_in_processes(PDF_SOURCES + GENERATORS)
+        for _ in PDF_SOURCES:
+            pdf_jobs.append(next(results))
+        created = list(results)
+        # Workers return their paths; report them here in listing order.
+        for path in created:
+            print(f"  Created {path}")
+        try:
+            pdf_paths = convert_staged(pdf_jobs, OFFICE_DIR)
+        except RuntimeError:
+            sys.exit(1)
+    finally:
+        remove_staged(pdf_jobs)
+    for path in pdf_paths:
+        print(f"  Created {path}")
 
     print("\nSyncing to support/office/...")
     sync_support_office()
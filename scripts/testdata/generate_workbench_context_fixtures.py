@@ -14,15 +14,21 @@ Run with the tool-worker venv so dependencies are available:
 from __future__ import annotations
 
 import os
-import subprocess
 import sys
 
 try:
-    from docx import Document
     from openpyxl import Workbook
     from pptx import Presentation
     from pptx.util import Inches as PptxInches
     from PIL import Image, ImageDraw, ImageFont
+
+    from fixture_common import (
+        convert_staged,
+        new_document,
+        remove_staged,
+        run_in_processes,
+        stage_docx,
+    )
 except Exception as exc:  # pragma: no cover
     print("ERROR: Missing dependencies for fixture generation.")
     print("Run using: engine/tools/pyworker/.venv/bin/python ...")
@@ -41,15 +47,15 @@ def _read_fixture_text(name: str) -> str:
         return f.read().strip()
 
 
-def _write_text(path: str, content: str) -> None:
+def _write_bytes(path: str, content: bytes) -> None:
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    with open(path, "wb") as f:
         f.write(content)
 
 
 def generate_company_overview_docx() -> str:
     content = _read_fixture_text("keenbench_company_context_v1.txt")
-    doc = Document()
+    doc = new_document()
     doc.add_heading("KeenBench Company Overview (Fictional QA)", level=1)
     doc.add_paragraph(
         "This document is test data for KeenBench Workbench Context file-mode processing."
@@ -64,7 +70,7 @@ def generate_company_overview_docx() -> str:
 
 def generate_engineering_department_brief_docx() -> str:
     content = _read_fixture_text("keenbench_department_engineering_brief.txt")
-    doc = Document()
+    doc = new_document()
     doc.add_heading("KeenBench Engineering Department Brief (Fictional QA)", level=1)
     doc.add_heading("Source Text", level=2)
     for line in content.splitlines():
@@ -182,57 +188,31 @@ def generate_unknown_bin() -> str:
     return path
 
 
-def generate_security_overview_pdf() -> str:
+def stage_security_overview_docx() -> tuple[str, str]:
     content = _read_fixture_text("keenbench_security_overview.txt")
-    doc = Document()
+    doc = new_document()
     doc.add_heading("KeenBench Security & Data Handling (Fictional QA)", level=1)
     for line in content.splitlines():
         doc.add_paragraph(line)
 
-    tmp_docx = os.path.join(FIXTURE_DIR, "_keenbench_security_overview_tmp.docx")
-    pdf_dst = os.path.join(FIXTURE_DIR, "keenbench_security_overview.pdf")
-    try:
-        doc.save(tmp_docx)
-        result = subprocess.run(
-            [
-                "/snap/bin/libreoffice",
-                "--headless",
-                "--convert-to",
-                "pdf",
-                "--outdir",
-                FIXTURE_DIR,
-                tmp_docx,
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
-        tmp_pdf = os.path.join(FIXTURE_DIR, "_keenbench_security_overview_tmp.pdf")
-        if os.path.exists(tmp_pdf):
-            os.replace(tmp_pdf, pdf_dst)
-        else:
-            print("ERROR: LibreOffice conversion failed.")
-            print(result.stderr.strip() or result.stdout.strip())
-            raise RuntimeError("LibreOffice did not produce expected PDF output")
-    finally:
-        if os.path.exists(tmp_docx):
-            os.remove(tmp_docx)
-    return pdf_dst
+    return stage_docx(doc, os.path.join(FIXTURE_DIR, "keenbench_security_overview.pdf"))
 
 
 def generate_context_clutter_payload() -> str:
     alpha = _read_fixture_text("keenbench_situation_alpha.txt")
-    filler = "token "
+    filler = b"token "
     # 90k repeats -> ~540k chars -> estimated weight ~135k tokens -> context_share ~0.675 on 200k context
-    payload = (
-        alpha
-        + "\n\n"
-        + "Clutter payload filler (do not edit):\n"
-        + (filler * 90_000)
-        + "\n"
+    payload = b"".join(
+        (
+            alpha.encode("utf-8"),
+            b"\n\n",
+            b"Clutter payload filler (do not edit):\n",
+            filler * 90_000,
+            b"\n",
+        )
     )
     path = os.path.join(ARTIFACTS_DIR, "keenbench_situation_clutter_payload.md")
-    _write_text(path, payload)
+    _write_bytes(path, payload)
     return path
 
 
@@ -240,15 +220,18 @@ def generate_oversize_csv() -> str:
     target_bytes = 26 * 1024 * 1024  # > 25MB limit
     path = os.path.join(ARTIFACTS_DIR, "keenbench_oversize_roster.csv")
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    header = "name,role,department,location,availability,qa_marker\n"
-    row = "Mira Kwon,CEO,Ops,Remote,Full-time,KEENBENCH_OVERSIZE_TEST\n"
-    written = 0
-    with open(path, "w", encoding="utf-8") as f:
+    header = b"name,role,department,location,availability,qa_marker\n"
+    row = b"Mira Kwon,CEO,Ops,Remote,Full-time,KEENBENCH_OVERSIZE_TEST\n"
+    # Same output as writing one row at a time until target_bytes is passed,
+    # but in ~1 MiB blocks.
+    remaining_rows = -(-(target_bytes - len(header)) // len(row))
+    block_rows = (1 << 20) // len(row)
+    with open(path, "wb") as f:
         f.write(header)
-        written += len(header.encode("utf-8"))
-        while written < target_bytes:
-            f.write(row)
-            written += len(row.encode("utf-8"))
+        while remaining_rows > 0:
+            count = min(block_rows, remaining_rows)
+            f.write(row * count)
+            remaining_rows -= count
     return path
 
 
@@ -256,16 +239,29 @@ def main() -> int:
     os.makedirs(FIXTURE_DIR, exist_ok=True)
     os.makedirs(ARTIFACTS_DIR, exist_ok=True)
 
-    created = []
-    created.append(generate_company_overview_docx())
-    created.append(generate_engineering_department_brief_docx())
-    created.append(generate_company_metrics_xlsx())
-    created.append(generate_pitch_deck_pptx())
-    created.append(generate_security_overview_pdf())
-    created.append(generate_logo_png())
-    created.append(generate_unknown_bin())
-    created.append(generate_context_clutter_payload())
-    created.append(generate_oversize_csv())
+    generators = [
+        generate_company_overview_docx,
+        generate_engineering_department_brief_docx,
+        generate_company_metrics_xlsx,
+        generate_pitch_deck_pptx,
+        generate_logo_png,
+        generate_unknown_bin,
+        generate_context_clutter_payload,
+        generate_oversize_csv,
+    ]
+    # Staged DOCX sources share one LibreOffice run after the pool finishes.
+    pdf_sources = [
+        stage_security_overview_docx,
+    ]
+    pdf_jobs: list[tuple[str, str]] = []
+    try:
+        results = run_in_processes(pdf_sources + generators)
+        for _ in pdf_sources:
+            pdf_jobs.append(next(results))
+        created = list(results)
+        created += convert_staged(pdf_jobs, FIXTURE_DIR)
+    finally:
+        remove_staged(pdf_jobs)
 
     print("Created:")
     for path in created: